@@ -0,0 +1,74 @@
+from fastapi import Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.models.models import Document
+from app.services.document_service import resolve_page_range
+from app.services.openai_service import OpenAIService
+from app.services.pdf_service import PDFService
+from app.services.summary_service import SummaryService
+from app.services.quiz_service import QuizService
+from app.services.qa_service import QAService
+from typing import Optional, Tuple
+
+def get_openai_service() -> OpenAIService:
+    """전역 공유 클라이언트를 사용하는 OpenAI 서비스 반환"""
+    try:
+        return OpenAIService()
+    except ValueError as e:
+        # API 키 미설정 등 설정 오류
+        raise HTTPException(status_code=400, detail=str(e))
+
+def get_pdf_service(
+    openai_service: OpenAIService = Depends(get_openai_service)
+) -> PDFService:
+    """PDF 처리 서비스 주입"""
+    return PDFService(openai_service)
+
+def get_summary_service(
+    openai_service: OpenAIService = Depends(get_openai_service)
+) -> SummaryService:
+    """요약 서비스 주입"""
+    return SummaryService(openai_service)
+
+def get_quiz_service(
+    openai_service: OpenAIService = Depends(get_openai_service)
+) -> QuizService:
+    """퀴즈 서비스 주입"""
+    return QuizService(openai_service)
+
+def get_qa_service(
+    openai_service: OpenAIService = Depends(get_openai_service)
+) -> QAService:
+    """Q&A 서비스 주입"""
+    return QAService(openai_service)
+
+def resolve_document_text(
+    db: Session,
+    document: Document,
+    page_start: Optional[int] = None,
+    page_end: Optional[int] = None
+) -> Tuple[str, Optional[Tuple[int, int]]]:
+    """
+    요청한 페이지 범위의 문서 텍스트 조회
+
+    Args:
+        db: 데이터베이스 세션
+        document: 문서
+        page_start: 시작 페이지 (1부터, 포함)
+        page_end: 끝 페이지 (포함)
+
+    Returns:
+        (범위 텍스트, Document.content 내 문자 구간 또는 None(문서 전체))
+    """
+    try:
+        char_range = resolve_page_range(db, document.id, page_start, page_end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if char_range is None:
+        return document.content, None
+
+    text = document.content[char_range[0]:char_range[1]]
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="선택한 페이지에 텍스트 내용이 없습니다.")
+
+    return text, char_range
@@ -0,0 +1,24 @@
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator
+import json
+
+def sse_event(event: str, data: dict) -> str:
+    """
+    SSE(server-sent events) 이벤트 문자열 생성
+
+    Args:
+        event: 이벤트 이름 (token / done / error)
+        data: JSON으로 보낼 데이터
+
+    Returns:
+        "event: ...\\ndata: ...\\n\\n" 형식 문자열
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """SSE 스트리밍 응답 생성 (프록시 버퍼링 비활성화)"""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -2,19 +2,120 @@ from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.config import settings
-from app.models.models import Document
+from app.models.models import Document, ProcessingJob
 from app.services.pdf_service import PDFService
+from app.api.deps import get_pdf_service
+from app.core.jobs import job_queue
+from app.services.document_service import (
+    find_processed_document, register_fingerprint, clone_document, save_pages, clone_pages
+)
+from app.services.chunk_store import build_chunk_store
+from app.services.retrieval_service import ensure_qa_indexes
+import asyncio
+import hashlib
 import os
 import uuid
 
 router = APIRouter()
 
+def _write_chunk(f, hasher, chunk: bytes):
+    """청크를 파일에 쓰고 해시에 반영 (워커 스레드에서 실행)"""
+    hasher.update(chunk)
+    f.write(chunk)
+
+async def _save_upload_stream(file: UploadFile, file_path: str) -> tuple:
+    """
+    업로드 파일을 청크 단위로 디스크에 스트리밍 저장하며 SHA-256 계산
+
+    Args:
+        file: 업로드 파일
+        file_path: 저장 경로
+
+    Returns:
+        (저장된 바이트 수, SHA-256 hex)
+    """
+    total = 0
+    hasher = hashlib.sha256()
+    f = await asyncio.to_thread(open, file_path, "wb")
+    try:
+        while True:
+            chunk = await file.read(settings.upload_chunk_size)
+            if not chunk:
+                break
+
+            total += len(chunk)
+            await asyncio.to_thread(_write_chunk, f, hasher, chunk)
+    finally:
+        await asyncio.to_thread(f.close)
+
+    return total, hasher.hexdigest()
+
+async def _store_upload(file: UploadFile) -> tuple:
+    """
+    업로드 파일 검증 후 저장
+
+    Args:
+        file: 업로드 파일
+
+    Returns:
+        (파일 ID, 저장 경로, SHA-256 hex)
+    """
+    # 파일 확장자 검증
+    if not file.filename.endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="PDF 파일만 업로드 가능합니다.")
+
+    # 파일 크기 검증 (큰 요청 본문은 UploadSizeLimitMiddleware가 폼 파싱 전에 거절,
+    # 여기서는 멀티파트 여유분 안에 들어온 파일만 걸러냄)
+    if file.size is not None and file.size > settings.max_upload_size:
+        raise HTTPException(status_code=400, detail="파일 크기가 너무 큽니다. (최대 50MB)")
+
+    # 파일 저장 (청크 단위 스트리밍, 메모리 사용량 일정)
+    file_id = str(uuid.uuid4())
+    file_path = os.path.join(settings.upload_dir, f"{file_id}.pdf")
+
+    os.makedirs(settings.upload_dir, exist_ok=True)
+
+    _, content_hash = await _save_upload_stream(file, file_path)
+
+    return file_id, file_path, content_hash
+
+def _reuse_processed_document(
+    db: Session,
+    file_id: str,
+    file_path: str,
+    filename: str,
+    content_hash: str,
+    use_ocr: bool,
+    analyze_images: bool
+):
+    """
+    같은 내용/옵션으로 처리된 문서가 있으면 결과를 재사용하는 새 문서 생성
+
+    Returns:
+        새 문서 또는 None (재사용할 문서가 없는 경우)
+    """
+    source = find_processed_document(db, content_hash, use_ocr, analyze_images)
+    if not source:
+        return None
+
+    # 같은 내용의 파일이 이미 있으면 새로 저장한 파일은 삭제하고 기존 파일 공유
+    if source.file_path and os.path.exists(source.file_path):
+        os.remove(file_path)
+        file_path = source.file_path
+
+    document = clone_document(source, file_id, filename, file_path)
+    db.add(document)
+    clone_pages(db, source.id, document.id)
+    build_chunk_store(db, document.id, document.content)
+    return document
+
 @router.post("/upload")
 async def upload_pdf(
     file: UploadFile = File(...),
     use_ocr: bool = False,
     analyze_images: bool = False,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    pdf_service: PDFService = Depends(get_pdf_service)
 ):
     """
     PDF 파일 업로드 및 처리
@@ -24,6 +125,7 @@ async def upload_pdf(
         use_ocr: OCR 사용 여부 (스캔본/이미지 PDF인 경우)
         analyze_images: 이미지/그래프 분석 여부
         db: 데이터베이스 세션
+        pdf_service: PDF 처리 서비스 (공유 OpenAI 클라이언트 주입)
 
     Returns:
         document_id: 생성된 문서 ID
@@ -32,61 +134,63 @@ async def upload_pdf(
         ocr_used: OCR 사용 여부
         image_analysis: 이미지 분석 결과
     """
-    # 파일 확장자 검증
-    if not file.filename.endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="PDF 파일만 업로드 가능합니다.")
-
-    # 파일 크기 검증
-    file_content = await file.read()
-    if len(file_content) > settings.max_upload_size:
-        raise HTTPException(status_code=400, detail="파일 크기가 너무 큽니다. (최대 50MB)")
-
-    # 파일 저장
-    file_id = str(uuid.uuid4())
-    file_path = os.path.join(settings.upload_dir, f"{file_id}.pdf")
-
-    os.makedirs(settings.upload_dir, exist_ok=True)
+    # 파일 검증 및 저장
+    file_id, file_path, content_hash = await _store_upload(file)
 
-    with open(file_path, "wb") as f:
-        f.write(file_content)
+    # 같은 파일을 같은 옵션으로 처리한 적이 있으면 결과 재사용
+    document = _reuse_processed_document(
+        db, file_id, file_path, file.filename, content_hash, use_ocr, analyze_images
+    )
+    if document:
+        db.commit()
+        db.refresh(document)
+        await ensure_qa_indexes(document.id)
 
-    # PDF 처리 서비스
-    pdf_service = PDFService()
+        return {
+            "document_id": document.id,
+            "filename": document.filename,
+            "content": document.content,
+            "ocr_used": document.ocr_used,
+            "image_analysis": document.image_analysis,
+            "deduplicated": True,
+            "message": "PDF 업로드 완료 (기존 처리 결과 재사용)"
+        }
 
     try:
-        # 텍스트 추출
-        if use_ocr:
-            content = await pdf_service.extract_text_with_ocr(file_path)
-            ocr_used = True
-        else:
-            content = await pdf_service.extract_text(file_path)
-            ocr_used = False
-
-        # 이미지/그래프 분석
-        image_analysis = None
-        if analyze_images:
-            image_analysis = await pdf_service.analyze_images(file_path)
+        # 텍스트 추출 / OCR / 이미지 분석
+        content, image_analysis, pages, failed_pages = await pdf_service.process_document(
+            file_path, use_ocr=use_ocr, analyze_images=analyze_images
+        )
 
         # 데이터베이스에 저장
         document = Document(
             id=file_id,
             filename=file.filename,
             content=content,
-            ocr_used=ocr_used,
+            ocr_used=any(page["ocr_used"] for page in pages),  # 실제로 Vision 처리된 페이지가 있을 때만
             image_analysis=image_analysis,
             file_path=file_path
         )
 
         db.add(document)
+        save_pages(db, document.id, pages)
+        build_chunk_store(db, document.id, document.content)
+        # 일부 페이지 Vision 실패나 빈 결과는 다음 업로드가 재사용하지 않도록 등록하지 않음
+        if content and not failed_pages:
+            register_fingerprint(db, content_hash, use_ocr, analyze_images, document.id)
         db.commit()
         db.refresh(document)
 
+        # Q&A 검색 색인도 수집 시 생성 (첫 질문에서 만들지 않도록)
+        await ensure_qa_indexes(document.id)
+
         return {
             "document_id": document.id,
             "filename": document.filename,
             "content": document.content,
             "ocr_used": document.ocr_used,
             "image_analysis": document.image_analysis,
+            "deduplicated": False,
             "message": "PDF 업로드 및 처리 완료"
         }
 
@@ -96,6 +200,110 @@ async def upload_pdf(
             os.remove(file_path)
         raise HTTPException(status_code=500, detail=f"PDF 처리 중 오류 발생: {str(e)}")
 
+@router.post("/jobs")
+async def create_pdf_job(
+    file: UploadFile = File(...),
+    use_ocr: bool = False,
+    analyze_images: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    PDF 파일 업로드 후 백그라운드 처리 작업 등록 (즉시 반환)
+
+    Args:
+        file: 업로드할 PDF 파일
+        use_ocr: OCR 사용 여부 (스캔본/이미지 PDF인 경우)
+        analyze_images: 이미지/그래프 분석 여부
+        db: 데이터베이스 세션
+
+    Returns:
+        job_id: 작업 ID (GET /jobs/{job_id}로 진행 상황 조회)
+        document_id: 처리 완료 시 생성될 문서 ID
+        status: 작업 상태
+    """
+    # 파일 검증 및 저장
+    file_id, file_path, content_hash = await _store_upload(file)
+
+    # 같은 파일을 같은 옵션으로 처리한 적이 있으면 결과를 재사용해 바로 완료 처리
+    document = _reuse_processed_document(
+        db, file_id, file_path, file.filename, content_hash, use_ocr, analyze_images
+    )
+
+    job = ProcessingJob(
+        document_id=file_id,
+        filename=file.filename,
+        file_path=document.file_path if document else file_path,
+        use_ocr=use_ocr,
+        analyze_images=analyze_images,
+        content_hash=content_hash,
+        status="completed" if document else "pending"
+    )
+
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    if document:
+        await ensure_qa_indexes(document.id)
+    else:
+        job_queue.enqueue(job.id)
+
+    return {
+        "job_id": job.id,
+        "document_id": job.document_id,
+        "filename": job.filename,
+        "status": job.status,
+        "message": "PDF 처리 작업 등록 완료"
+    }
+
+@router.get("/jobs/{job_id}")
+async def get_pdf_job(job_id: str, db: Session = Depends(get_db)):
+    """
+    PDF 처리 작업 상태 조회
+
+    Args:
+        job_id: 작업 ID
+        db: 데이터베이스 세션
+
+    Returns:
+        작업 상태, 페이지 진행률, 완료 시 처리 결과
+    """
+    job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
+
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+
+    total_pages = job.total_pages or 0
+    processed_pages = job.processed_pages or 0
+
+    result = None
+    if job.status == "completed":
+        document = db.query(Document).filter(Document.id == job.document_id).first()
+        if document:
+            result = {
+                "document_id": document.id,
+                "filename": document.filename,
+                "content": document.content,
+                "ocr_used": document.ocr_used,
+                "image_analysis": document.image_analysis
+            }
+
+    return {
+        "job_id": job.id,
+        "document_id": job.document_id,
+        "filename": job.filename,
+        "status": job.status,
+        "progress": {
+            "processed_pages": processed_pages,
+            "total_pages": total_pages,
+            "percent": round(processed_pages / total_pages * 100, 1) if total_pages else 0.0
+        },
+        "error": job.error,
+        "result": result,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at
+    }
+
 @router.get("/{document_id}")
 async def get_document(document_id: str, db: Session = Depends(get_db)):
     """
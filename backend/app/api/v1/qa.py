@@ -3,7 +3,11 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.models.models import Document
 from app.services.qa_service import QAService
+from app.api.deps import get_qa_service, resolve_document_text
+from app.services.retrieval_service import retrieve_chunks, ensure_qa_indexes
+from app.api.sse import sse_event, sse_response
 from pydantic import BaseModel
+from typing import Optional
 
 router = APIRouter()
 
@@ -11,18 +15,22 @@ class QARequest(BaseModel):
     """Q&A 요청 모델"""
     document_id: str
     question: str
+    page_start: Optional[int] = None  # 검색할 시작 페이지 (1부터, 없으면 처음부터)
+    page_end: Optional[int] = None  # 검색할 끝 페이지 (포함, 없으면 끝까지)
 
 @router.post("/ask")
 async def ask_question(
     request: QARequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    qa_service: QAService = Depends(get_qa_service)
 ):
     """
     문서 기반 질문 응답
 
     Args:
-        request: Q&A 요청 (document_id, question)
+        request: Q&A 요청 (document_id, question, 선택적 page_start/page_end)
         db: 데이터베이스 세션
+        qa_service: Q&A 서비스
 
     Returns:
         question: 질문
@@ -38,14 +46,21 @@ async def ask_question(
     if not document.content:
         raise HTTPException(status_code=400, detail="문서에 텍스트 내용이 없습니다.")
 
-    # Q&A 서비스
-    qa_service = QAService()
+    # 페이지 범위 지정 시 해당 범위에서만 검색
+    text, char_range = resolve_document_text(db, document, request.page_start, request.page_end)
 
     try:
+        # 문서 색인 검색 (BM25 / 로컬 벡터 / 혼합, 수집 시 색인이 없던 문서만 워커 스레드에서 생성)
+        await ensure_qa_indexes(document.id)
+        top_chunks = retrieve_chunks(
+            db, document.id, document.content, request.question, char_range=char_range
+        )
+
         # 답변 생성
         answer, context = await qa_service.answer_question(
-            full_text=document.content,
-            question=request.question
+            full_text=text,
+            question=request.question,
+            top_chunks=top_chunks
         )
 
         return {
@@ -62,3 +77,73 @@ async def ask_question(
     except Exception as e:
         # 기타 예상치 못한 에러
         raise HTTPException(status_code=500, detail=f"답변 생성 중 오류 발생: {str(e)}")
+
+@router.post("/ask/stream")
+async def ask_question_stream(
+    request: QARequest,
+    db: Session = Depends(get_db),
+    qa_service: QAService = Depends(get_qa_service)
+):
+    """
+    문서 기반 질문 응답 (SSE 스트리밍)
+
+    Args:
+        request: Q&A 요청 (document_id, question, 선택적 page_start/page_end)
+        db: 데이터베이스 세션
+        qa_service: Q&A 서비스
+
+    Returns:
+        text/event-stream
+        - token: {"text": 답변 조각}
+        - done: {"document_id", "question", "answer", "context_used"}
+        - error: {"status_code", "detail"}
+    """
+    # 문서 조회 (스트림 시작 전에 검증해 일반 HTTP 오류로 응답)
+    document = db.query(Document).filter(Document.id == request.document_id).first()
+
+    if not document:
+        raise HTTPException(status_code=404, detail="문서를 찾을 수 없습니다.")
+
+    if not document.content:
+        raise HTTPException(status_code=400, detail="문서에 텍스트 내용이 없습니다.")
+
+    # 페이지 범위 지정 시 해당 범위에서만 검색
+    text, char_range = resolve_document_text(db, document, request.page_start, request.page_end)
+
+    try:
+        # 수집 시 만들어 두지 못한 문서만 이때 색인 생성 (워커 스레드)
+        await ensure_qa_indexes(document.id)
+        top_chunks = retrieve_chunks(
+            db, document.id, document.content, request.question, char_range=char_range
+        )
+        context, stream = qa_service.stream_answer(
+            full_text=text,
+            question=request.question,
+            top_chunks=top_chunks
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"답변 생성 중 오류 발생: {str(e)}")
+
+    document_id = document.id
+
+    async def events():
+        pieces = []
+        try:
+            async for piece in stream:
+                pieces.append(piece)
+                yield sse_event("token", {"text": piece})
+
+            yield sse_event("done", {
+                "document_id": document_id,
+                "question": request.question,
+                "answer": "".join(pieces),
+                "context_used": context[:500] + "..." if len(context) > 500 else context
+            })
+
+        except ValueError as e:
+            # OpenAI API 관련 에러 (인증, 사용량 제한 등)
+            yield sse_event("error", {"status_code": 400, "detail": str(e)})
+        except Exception as e:
+            yield sse_event("error", {"status_code": 500, "detail": f"답변 생성 중 오류 발생: {str(e)}"})
+
+    return sse_response(events())
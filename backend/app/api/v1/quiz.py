@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.models.models import Document, Quiz, QuizResult, WrongAnswer
+from app.models.models import Document, Quiz, QuizResult, WrongAnswer, DocumentKeypoints
 from app.services.quiz_service import QuizService
+from app.api.deps import get_quiz_service, resolve_document_text
+from app.services.chunk_store import get_document_chunks
+from app.core.config import settings
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 router = APIRouter()
 
@@ -12,23 +15,52 @@ class QuizGenerateRequest(BaseModel):
     """퀴즈 생성 요청 모델"""
     document_id: str
     num_items: int = 10
+    page_start: Optional[int] = None  # 출제할 시작 페이지 (1부터, 없으면 처음부터)
+    page_end: Optional[int] = None  # 출제할 끝 페이지 (포함, 없으면 끝까지)
 
 class QuizSubmitRequest(BaseModel):
     """퀴즈 제출 요청 모델"""
     quiz_id: str
     answers: List[Dict[str, Any]]
 
+async def _load_keypoints(db: Session, document: Document, quiz_service: QuizService) -> str:
+    """
+    문서 키포인트 조회 (없으면 추출 후 저장)
+
+    Args:
+        db: 데이터베이스 세션
+        document: 문서
+        quiz_service: 퀴즈 서비스
+
+    Returns:
+        핵심 키포인트
+    """
+    saved = db.query(DocumentKeypoints).filter(DocumentKeypoints.document_id == document.id).first()
+    if saved:
+        return saved.keypoints
+
+    chunks = get_document_chunks(db, document.id, document.content, settings.quiz_chunk_size)
+    keypoints = await quiz_service.extract_keypoints(document.content, chunks=chunks)
+
+    # 동시 요청이 먼저 저장했어도 충돌 없이 덮어쓰기
+    db.merge(DocumentKeypoints(document_id=document.id, keypoints=keypoints))
+    db.commit()
+
+    return keypoints
+
 @router.post("/generate")
 async def generate_quiz(
     request: QuizGenerateRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    quiz_service: QuizService = Depends(get_quiz_service)
 ):
     """
     문서 기반 퀴즈 생성
 
     Args:
-        request: 퀴즈 생성 요청 (document_id, num_items)
+        request: 퀴즈 생성 요청 (document_id, num_items, 선택적 page_start/page_end)
         db: 데이터베이스 세션
+        quiz_service: 퀴즈 서비스
 
     Returns:
         quiz_id: 생성된 퀴즈 ID
@@ -43,12 +75,24 @@ async def generate_quiz(
     if not document.content:
         raise HTTPException(status_code=400, detail="문서에 텍스트 내용이 없습니다.")
 
-    # 퀴즈 생성 서비스
-    quiz_service = QuizService()
+    # 페이지 범위 지정 시 해당 범위에서만 출제
+    text, char_range = resolve_document_text(db, document, request.page_start, request.page_end)
 
     try:
+        if char_range is None:
+            # 저장된 키포인트 재사용 (처음 퀴즈를 만드는 문서만 추출)
+            keypoints = await _load_keypoints(db, document, quiz_service)
+        else:
+            # 범위별 키포인트는 저장하지 않음 (범위 안의 청크만 처리)
+            chunks = get_document_chunks(
+                db, document.id, document.content, settings.quiz_chunk_size, char_range
+            )
+            keypoints = await quiz_service.extract_keypoints(text, chunks=chunks)
+
         # 퀴즈 생성
-        quiz_items = await quiz_service.generate_quiz(document.content, request.num_items)
+        quiz_items = await quiz_service.generate_quiz(
+            text, request.num_items, keypoints=keypoints
+        )
 
         # 데이터베이스에 저장
         quiz = Quiz(
@@ -77,7 +121,8 @@ async def generate_quiz(
 @router.post("/submit")
 async def submit_quiz(
     request: QuizSubmitRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    quiz_service: QuizService = Depends(get_quiz_service)
 ):
     """
     퀴즈 제출 및 채점
@@ -85,6 +130,7 @@ async def submit_quiz(
     Args:
         request: 퀴즈 제출 요청 (quiz_id, answers)
         db: 데이터베이스 세션
+        quiz_service: 퀴즈 서비스
 
     Returns:
         result_id: 결과 ID
@@ -97,9 +143,6 @@ async def submit_quiz(
     if not quiz:
         raise HTTPException(status_code=404, detail="퀴즈를 찾을 수 없습니다.")
 
-    # 퀴즈 채점 서비스
-    quiz_service = QuizService()
-
     try:
         # 채점
         results, accuracy = await quiz_service.grade_quiz(quiz.items, request.answers)
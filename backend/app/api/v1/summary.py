@@ -1,27 +1,36 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
 from app.models.models import Document, Summary
 from app.services.summary_service import SummaryService
+from app.api.deps import get_summary_service, resolve_document_text
+from app.api.sse import sse_event, sse_response
+from app.services.chunk_store import get_document_chunks
+from app.core.config import settings
 from pydantic import BaseModel
+from typing import Optional
 
 router = APIRouter()
 
 class SummaryRequest(BaseModel):
     """요약 생성 요청 모델"""
     document_id: str
+    page_start: Optional[int] = None  # 요약할 시작 페이지 (1부터, 없으면 처음부터)
+    page_end: Optional[int] = None  # 요약할 끝 페이지 (포함, 없으면 끝까지)
 
 @router.post("/generate")
 async def generate_summary(
     request: SummaryRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    summary_service: SummaryService = Depends(get_summary_service)
 ):
     """
     문서 요약 생성
 
     Args:
-        request: 요약 생성 요청 (document_id)
+        request: 요약 생성 요청 (document_id, 선택적 page_start/page_end)
         db: 데이터베이스 세션
+        summary_service: 요약 서비스
 
     Returns:
         summary_id: 생성된 요약 ID
@@ -36,12 +45,13 @@ async def generate_summary(
     if not document.content:
         raise HTTPException(status_code=400, detail="문서에 텍스트 내용이 없습니다.")
 
-    # 요약 생성 서비스
-    summary_service = SummaryService()
+    # 페이지 범위 지정 시 해당 범위만 요약
+    text, char_range = resolve_document_text(db, document, request.page_start, request.page_end)
 
     try:
-        # 요약 생성
-        summary_content = await summary_service.generate_summary(document.content)
+        # 요약 생성 (수집 시 저장된 청크 재사용)
+        chunks = get_document_chunks(db, document.id, document.content, settings.chunk_size, char_range)
+        summary_content = await summary_service.generate_summary(text, chunks=chunks)
 
         # 데이터베이스에 저장
         summary = Summary(
@@ -57,6 +67,8 @@ async def generate_summary(
             "summary_id": summary.id,
             "document_id": document.id,
             "content": summary.content,
+            "page_start": request.page_start,
+            "page_end": request.page_end,
             "message": "요약 생성 완료"
         }
 
@@ -67,6 +79,74 @@ async def generate_summary(
         # 기타 예상치 못한 에러
         raise HTTPException(status_code=500, detail=f"요약 생성 중 오류 발생: {str(e)}")
 
+@router.post("/generate/stream")
+async def generate_summary_stream(
+    request: SummaryRequest,
+    db: Session = Depends(get_db),
+    summary_service: SummaryService = Depends(get_summary_service)
+):
+    """
+    문서 요약 생성 (SSE 스트리밍, 스트림 완료 시 요약 저장)
+
+    Args:
+        request: 요약 생성 요청 (document_id, 선택적 page_start/page_end)
+        db: 데이터베이스 세션
+        summary_service: 요약 서비스
+
+    Returns:
+        text/event-stream
+        - token: {"text": 요약 조각}
+        - done: {"summary_id", "document_id", "content"}
+        - error: {"status_code", "detail"}
+    """
+    # 문서 조회 (스트림 시작 전에 검증해 일반 HTTP 오류로 응답)
+    document = db.query(Document).filter(Document.id == request.document_id).first()
+
+    if not document:
+        raise HTTPException(status_code=404, detail="문서를 찾을 수 없습니다.")
+
+    if not document.content:
+        raise HTTPException(status_code=400, detail="문서에 텍스트 내용이 없습니다.")
+
+    # 페이지 범위 지정 시 해당 범위만 요약
+    content, char_range = resolve_document_text(db, document, request.page_start, request.page_end)
+    document_id = document.id
+    chunks = get_document_chunks(db, document.id, document.content, settings.chunk_size, char_range)
+
+    async def events():
+        pieces = []
+        try:
+            async for piece in summary_service.stream_summary(content, chunks=chunks):
+                pieces.append(piece)
+                yield sse_event("token", {"text": piece})
+
+            # 스트림이 끝까지 완료된 경우에만 저장 (요청 세션은 응답 중 닫힐 수 있어 별도 세션 사용)
+            stream_db = SessionLocal()
+            try:
+                summary = Summary(
+                    document_id=document_id,
+                    content="".join(pieces)
+                )
+                stream_db.add(summary)
+                stream_db.commit()
+                stream_db.refresh(summary)
+
+                yield sse_event("done", {
+                    "summary_id": summary.id,
+                    "document_id": document_id,
+                    "content": summary.content
+                })
+            finally:
+                stream_db.close()
+
+        except ValueError as e:
+            # OpenAI API 관련 에러 (인증, 사용량 제한 등)
+            yield sse_event("error", {"status_code": 400, "detail": str(e)})
+        except Exception as e:
+            yield sse_event("error", {"status_code": 500, "detail": f"요약 생성 중 오류 발생: {str(e)}"})
+
+    return sse_response(events())
+
 @router.get("/{summary_id}")
 async def get_summary(summary_id: str, db: Session = Depends(get_db)):
     """
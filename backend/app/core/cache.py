@@ -1,11 +1,61 @@
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Tuple
+from collections import OrderedDict
+from app.core.config import settings
+import heapq
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+def _estimate_size(value: Any) -> int:
+    """
+    캐시 항목의 대략적인 메모리 사용량 계산 (바이트)
+
+    Args:
+        value: 크기를 계산할 값
+
+    Returns:
+        추정 바이트 수
+    """
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        size += sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_estimate_size(item) for item in value)
+
+    return size
 
 class SimpleCache:
-    """간단한 메모리 기반 캐시 (Redis 대체)"""
+    """
+    메모리 기반 캐시 (Redis 대체)
 
-    def __init__(self):
-        self.cache: Dict[str, Dict[str, Any]] = {}
+    항목 수/바이트 예산을 넘으면 가장 오래 사용하지 않은 항목부터 제거(LRU)하고,
+    만료 시각 힙으로 만료된 항목을 조회 여부와 관계없이 정리한다.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            max_entries: 최대 항목 수 (0이면 제한 없음)
+            max_bytes: 최대 메모리 사용량 (바이트, 0이면 제한 없음)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        # key -> (value, 만료 시각, 크기), 최근 사용 항목이 뒤쪽
+        self.cache: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        # (만료 시각, key) 힙 - 갱신된 키의 이전 항목은 정리 시 무시
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._lock = threading.RLock()
+
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
 
     def set(self, key: str, value: Any, expire: int = 3600):
         """
@@ -16,10 +66,272 @@ class SimpleCache:
             value: 저장할 값
             expire: 만료 시간 (초)
         """
-        self.cache[key] = {
-            "value": value,
-            "expire_at": datetime.now() + timedelta(seconds=expire)
-        }
+        size = _estimate_size(key) + _estimate_size(value)
+        expire_at = time.monotonic() + expire
+
+        with self._lock:
+            self._remove(key)
+
+            # 예산보다 큰 항목은 저장하지 않음
+            if self.max_bytes and size > self.max_bytes:
+                return
+
+            self.cache[key] = (value, expire_at, size)
+            self.total_bytes += size
+            heapq.heappush(self._expiry_heap, (expire_at, key))
+
+            self._purge_expired()
+            self._evict_over_budget()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        캐시에서 값 조회
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            캐시된 값 또는 None
+        """
+        with self._lock:
+            self._purge_expired()
+
+            item = self.cache.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def delete(self, key: str):
+        """
+        캐시에서 값 삭제
+
+        Args:
+            key: 캐시 키
+        """
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        """모든 캐시 삭제"""
+        with self._lock:
+            self.cache.clear()
+            self._expiry_heap.clear()
+            self.total_bytes = 0
+
+    def exists(self, key: str) -> bool:
+        """
+        캐시 키 존재 여부 확인
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            존재 여부
+        """
+        with self._lock:
+            self._purge_expired()
+            return key in self.cache
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계 조회
+
+        Returns:
+            항목 수, 사용 바이트, 적중/실패/제거/만료 횟수
+        """
+        with self._lock:
+            self._purge_expired()
+            lookups = self.hits + self.misses
+
+            return {
+                "backend": "memory",
+                "entries": len(self.cache),
+                "bytes": self.total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+    def _remove(self, key: str) -> bool:
+        """항목 제거 (힙 항목은 정리 시 무시됨)"""
+        item = self.cache.pop(key, None)
+        if item is None:
+            return False
+
+        self.total_bytes -= item[2]
+        return True
+
+    def _purge_expired(self):
+        """만료 시각이 지난 항목을 힙 순서대로 정리"""
+        now = time.monotonic()
+
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expire_at, key = heapq.heappop(self._expiry_heap)
+            item = self.cache.get(key)
+
+            # 이후에 다시 저장된 키의 이전 힙 항목은 무시
+            if item is not None and item[1] == expire_at:
+                self._remove(key)
+                self.expirations += 1
+
+        # 갱신/삭제로 쌓인 무효 힙 항목이 많으면 재구성
+        if len(self._expiry_heap) > 2 * len(self.cache) + 64:
+            self._expiry_heap = [(item[1], key) for key, item in self.cache.items()]
+            heapq.heapify(self._expiry_heap)
+
+    def _evict_over_budget(self):
+        """항목 수/바이트 예산을 넘으면 LRU 순으로 제거"""
+        while self.cache and (
+            (self.max_entries and len(self.cache) > self.max_entries)
+            or (self.max_bytes and self.total_bytes > self.max_bytes)
+        ):
+            key = next(iter(self.cache))
+            self._remove(key)
+            self.evictions += 1
+
+class SQLiteCache:
+    """
+    SQLite 기반 영속 캐시 (재시작/여러 워커 프로세스 간 공유)
+
+    WAL 모드로 여러 프로세스가 동시에 읽고 쓸 수 있으며,
+    만료 항목 정리 후 항목 수/바이트 예산을 넘으면 마지막 조회 시각이 오래된 항목부터 제거한다.
+    값은 JSON으로 직렬화한다.
+
+    이벤트 루프에서 동기 호출되므로 조회는 읽기만 하고(WAL에서는 쓰기에 막히지 않음),
+    조회 시각 갱신은 모아 두었다가 다음 저장 트랜잭션에서 한 번에 반영한다.
+    항목 수/바이트 합계는 cache_meta 테이블의 누적값으로 관리해 저장마다 전체 집계를 하지 않는다.
+    """
+
+    # 모아 둘 조회 시각 갱신 최대 개수 (넘으면 새 갱신은 버림)
+    MAX_PENDING_TOUCHES = 1000
+
+    def __init__(
+        self,
+        db_path: str,
+        max_entries: int = 10000,
+        max_bytes: int = 256 * 1024 * 1024,
+        busy_timeout: float = 1.0
+    ):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+            max_entries: 최대 항목 수 (0이면 제한 없음)
+            max_bytes: 최대 저장 용량 (바이트, 0이면 제한 없음)
+            busy_timeout: 다른 프로세스의 쓰기 잠금 대기 시간 (초, 넘으면 저장 생략)
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._touch_lock = threading.Lock()
+        self._pending_touches: Dict[str, float] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expire_at REAL NOT NULL, "
+                "size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_expire_at ON cache_entries (expire_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_accessed_at ON cache_entries (accessed_at)")
+
+            # 누적 항목 수/바이트 (처음 만들 때만 기존 항목을 한 번 집계)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_meta ("
+                "id INTEGER PRIMARY KEY CHECK (id = 0), entries INTEGER NOT NULL, bytes INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO cache_meta (id, entries, bytes) "
+                "SELECT 0, COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 SQLite 연결 반환"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _adjust_totals(self, conn: sqlite3.Connection, entries: int, size: int):
+        """누적 항목 수/바이트 갱신 (쓰기 트랜잭션 안에서 호출)"""
+        if entries or size:
+            conn.execute(
+                "UPDATE cache_meta SET entries = entries + ?, bytes = bytes + ? WHERE id = 0",
+                (entries, size)
+            )
+
+    def _flush_touches(self, conn: sqlite3.Connection):
+        """모아 둔 조회 시각 갱신 반영 (쓰기 트랜잭션 안에서 호출)"""
+        with self._touch_lock:
+            touches, self._pending_touches = self._pending_touches, {}
+
+        if touches:
+            conn.executemany(
+                "UPDATE cache_entries SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in touches.items()]
+            )
+
+    def set(self, key: str, value: Any, expire: int = 3600):
+        """
+        캐시에 값 저장 (다른 프로세스의 쓰기 잠금이 busy_timeout 안에 풀리지 않으면 저장 생략)
+
+        Args:
+            key: 캐시 키
+            value: 저장할 값 (JSON 직렬화 가능)
+            expire: 만료 시간 (초)
+        """
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(key.encode("utf-8")) + len(payload.encode("utf-8"))
+
+        # 예산보다 큰 항목은 저장하지 않음
+        if self.max_bytes and size > self.max_bytes:
+            return
+
+        now = time.time()
+        conn = self._conn()
+        try:
+            with conn:
+                # 저장과 예산 정리를 한 쓰기 트랜잭션으로 처리 (다른 프로세스와 직렬화)
+                conn.execute("BEGIN IMMEDIATE")
+                self._flush_touches(conn)
+
+                old = conn.execute(
+                    "SELECT size FROM cache_entries WHERE key = ?", (key,)
+                ).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries (key, value, expire_at, size, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, now + expire, size, now)
+                )
+                self._adjust_totals(conn, 0 if old else 1, size - (old[0] if old else 0))
+
+                self._evict(conn, now, keep_key=key)
+        except sqlite3.OperationalError:
+            # 잠금 경합 시 이벤트 루프를 오래 막지 않도록 캐시 저장만 포기
+            pass
 
     def get(self, key: str) -> Optional[Any]:
         """
@@ -31,14 +343,25 @@ class SimpleCache:
         Returns:
             캐시된 값 또는 None
         """
-        if key in self.cache:
-            item = self.cache[key]
-            if datetime.now() < item["expire_at"]:
-                return item["value"]
-            else:
-                # 만료된 항목 삭제
-                del self.cache[key]
-        return None
+        now = time.time()
+        try:
+            row = self._conn().execute(
+                "SELECT value FROM cache_entries WHERE key = ? AND expire_at > ?",
+                (key, now)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        with self._touch_lock:
+            if key in self._pending_touches or len(self._pending_touches) < self.MAX_PENDING_TOUCHES:
+                self._pending_touches[key] = now
+
+        self.hits += 1
+        return json.loads(row[0])
 
     def delete(self, key: str):
         """
@@ -47,12 +370,24 @@ class SimpleCache:
         Args:
             key: 캐시 키
         """
-        if key in self.cache:
-            del self.cache[key]
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT size FROM cache_entries WHERE key = ?", (key,)).fetchone()
+            if row:
+                conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self._adjust_totals(conn, -1, -row[0])
 
     def clear(self):
         """모든 캐시 삭제"""
-        self.cache.clear()
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM cache_entries")
+            conn.execute("UPDATE cache_meta SET entries = 0, bytes = 0 WHERE id = 0")
+
+        with self._touch_lock:
+            self._pending_touches = {}
 
     def exists(self, key: str) -> bool:
         """
@@ -64,7 +399,100 @@ class SimpleCache:
         Returns:
             존재 여부
         """
-        return self.get(key) is not None
+        row = self._conn().execute(
+            "SELECT 1 FROM cache_entries WHERE key = ? AND expire_at > ?",
+            (key, time.time())
+        ).fetchone()
+        return row is not None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계 조회 (적중/실패 횟수는 현재 프로세스 기준)
+
+        Returns:
+            항목 수, 사용 바이트, 적중/실패/제거/만료 횟수
+            (항목 수/바이트는 누적값이라 아직 정리되지 않은 만료 항목 포함)
+        """
+        entries, total_bytes = self._conn().execute(
+            "SELECT entries, bytes FROM cache_meta WHERE id = 0"
+        ).fetchone()
+        lookups = self.hits + self.misses
+
+        return {
+            "backend": "sqlite",
+            "entries": entries,
+            "bytes": total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+    def _evict(self, conn: sqlite3.Connection, now: float, keep_key: str = None):
+        """
+        만료 항목 정리 후 항목 수/바이트 예산 안으로 들어올 때까지 오래된 조회 순으로 제거
+        (쓰기 트랜잭션 안에서 호출, keep_key는 방금 저장한 항목이라 제거하지 않음)
+        """
+        expired_count, expired_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries WHERE expire_at <= ?", (now,)
+        ).fetchone()
+        if expired_count:
+            conn.execute("DELETE FROM cache_entries WHERE expire_at <= ?", (now,))
+            self._adjust_totals(conn, -expired_count, -expired_bytes)
+            self.expirations += expired_count
+
+        entries, total_bytes = conn.execute(
+            "SELECT entries, bytes FROM cache_meta WHERE id = 0"
+        ).fetchone()
+
+        def over_budget() -> bool:
+            return (self.max_entries and entries > self.max_entries) or (
+                self.max_bytes and total_bytes > self.max_bytes
+            )
+
+        if not over_budget():
+            return
+
+        # 두 예산을 함께 확인하며 오래된 조회 순으로 필요한 만큼만 제거
+        keys = []
+        freed = 0
+        for key, size in conn.execute(
+            "SELECT key, size FROM cache_entries WHERE key != ? ORDER BY accessed_at",
+            (keep_key or "",)
+        ):
+            keys.append(key)
+            freed += size
+            entries -= 1
+            total_bytes -= size
+            if not over_budget():
+                break
+
+        conn.executemany("DELETE FROM cache_entries WHERE key = ?", [(k,) for k in keys])
+        self._adjust_totals(conn, -len(keys), -freed)
+        self.evictions += len(keys)
+
+def create_cache():
+    """
+    설정(settings.cache_backend)에 따라 캐시 백엔드 생성
+
+    Returns:
+        memory: 프로세스 내 SimpleCache / sqlite: 프로세스 간 공유 SQLiteCache
+    """
+    if settings.cache_backend == "sqlite":
+        return SQLiteCache(
+            db_path=settings.cache_db_path,
+            max_entries=settings.cache_max_entries,
+            max_bytes=settings.cache_max_bytes,
+            busy_timeout=settings.cache_busy_timeout
+        )
+
+    return SimpleCache(
+        max_entries=settings.cache_max_entries,
+        max_bytes=settings.cache_max_bytes
+    )
 
 # 전역 캐시 인스턴스
-cache = SimpleCache()
+cache = create_cache()
@@ -18,6 +18,7 @@ class Settings(BaseSettings):
     # 파일 업로드 설정
     upload_dir: str = os.getenv("UPLOAD_DIR", "./data/uploads")
     max_upload_size: int = 50 * 1024 * 1024  # 50MB
+    upload_chunk_size: int = 1024 * 1024  # 1MB - 스트리밍 저장 단위
 
     # API 설정
     api_version: str = "v1"
@@ -32,14 +33,70 @@ class Settings(BaseSettings):
 
     # 텍스트 청킹 설정
     chunk_size: int = 6000
+    quiz_chunk_size: int = 4000  # 퀴즈 키포인트 추출용 청크 크기
+    chunk_overlap: int = 0  # 이전 청크 끝 문장을 다음 청크에 이어 붙일 최대 문자 수
+    qa_chunk_size: int = 3000  # Q&A 검색용 청크 크기
+    qa_top_k: int = 4  # Q&A 컨텍스트에 사용할 상위 청크 수
+    qa_max_ctx_tokens: int = 6000  # Q&A 컨텍스트 토큰 예산 (추정치 기준)
+    qa_retrieval_mode: str = "bm25"  # bm25 / dense (로컬 해시 벡터) / hybrid
+    qa_hybrid_alpha: float = 0.5  # hybrid 모드에서 벡터 점수 가중치 (0~1)
+
+    # 로컬 벡터 색인 설정
+    vector_dim: int = 1024
+    vector_index_dir: str = os.getenv("VECTOR_INDEX_DIR", "./data/vectors")
+
+    # 청크별 LLM 호출 동시 실행 수 (map 단계)
+    llm_max_concurrency: int = 8
+
+    # 계층적 reduce 단계에서 한 번에 묶을 부분 결과의 최대 문자 수
+    reduce_max_chars: int = 12000
+
+    # OCR 설정
+    ocr_max_concurrency: int = 4  # 페이지 OCR 동시 실행 수
+    ocr_max_retries: int = 2  # 페이지별 Vision 호출 재시도 횟수 (일시적 오류만)
+    ocr_max_failed_ratio: float = 0.2  # Vision 호출 실패 비율이 이를 넘으면 문서 처리 실패
+    ocr_mode: str = "auto"  # auto: 텍스트 레이어가 부실한 페이지만 OCR / all: 모든 페이지 OCR
+    ocr_min_text_density: float = 2.0  # 100x100pt 당 최소 글자 수 (미만이면 OCR 대상)
+    ocr_max_garbled_ratio: float = 0.2  # 깨진 글자 비율 상한 (초과하면 OCR 대상)
+
+    # 그림 페이지 판별 설정 (이미지 분석 대상 선정)
+    figure_min_image_ratio: float = 0.1  # 이미지 면적 합계가 페이지의 이 비율 이상이면 그림 페이지
+    figure_tiny_image_ratio: float = 0.01  # 이 비율 미만의 작은 이미지는 무시
+    figure_min_drawings: int = 20  # 벡터 도형이 이 개수 이상이면 그래프/도식 페이지
+    figure_detect_tables: bool = True  # 표가 있는 페이지도 분석
+    figure_repeat_min_pages: int = 3  # 이 페이지 수 이상 반복되는 이미지(로고 등)는 무시
+
+    # PDF 파싱/렌더링 프로세스 풀 설정
+    pdf_worker_processes: int = 2  # 0이면 프로세스 풀 대신 스레드 사용
+    pdf_pages_per_task: int = 4  # 워커 작업 하나가 처리할 페이지 수
+
+    # 백그라운드 PDF 처리 작업 설정
+    job_workers: int = 2  # 동시에 처리할 PDF 작업 수
+    job_stale_seconds: int = 600  # 이 시간 동안 진행 갱신이 없는 처리 중 작업만 재시작 시 복구
+
+    # Vision 입력 이미지 설정
+    vision_image_dpi: int = 200
+    vision_image_format: str = "png"  # png / jpeg / webp
+    vision_image_quality: int = 85  # jpeg / webp 품질
+    vision_image_max_side: int = 2048  # 긴 변 최대 픽셀 (GPT-4o 유효 해상도), 0이면 제한 없음
 
     # 캐시 설정
     cache_expire_seconds: int = 3600
+    cache_backend: str = os.getenv("CACHE_BACKEND", "sqlite")  # memory / sqlite (재시작/워커 간 공유)
+    cache_db_path: str = os.getenv("CACHE_DB_PATH", "./data/cache.db")
+    cache_max_entries: int = 10000  # 최대 항목 수
+    cache_max_bytes: int = 256 * 1024 * 1024  # 256MB - 최대 사용량 (메모리 또는 디스크)
+    cache_busy_timeout: float = 1.0  # sqlite 백엔드 쓰기 잠금 대기 시간 (초, 넘으면 저장 생략)
 
     # 타임아웃 설정 (초 단위)
     openai_timeout: float = 1800.0  # 30분 - OpenAI API 타임아웃
     request_timeout: float = 1800.0  # 30분 - 전체 요청 타임아웃
 
+    # OpenAI HTTP 커넥션 풀 설정
+    openai_max_connections: int = 100
+    openai_max_keepalive_connections: int = 20
+    openai_keepalive_expiry: float = 30.0  # 유휴 커넥션 유지 시간 (초)
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -0,0 +1,100 @@
+from concurrent.futures import ProcessPoolExecutor
+from app.core.config import settings
+from typing import Optional, Callable, Any, Awaitable, Iterable, List, Tuple
+import asyncio
+import functools
+import multiprocessing
+
+# 프로세스 전역 CPU 작업용 프로세스 풀 (lifespan에서 생성/종료)
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+def init_process_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    PDF 파싱/렌더링용 프로세스 풀 생성
+
+    Returns:
+        프로세스 풀 (settings.pdf_worker_processes가 0이면 None → 스레드 사용)
+    """
+    global _process_pool
+
+    if _process_pool is None and settings.pdf_worker_processes > 0:
+        # 이벤트 루프가 도는 프로세스를 fork하지 않도록 spawn 사용
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.pdf_worker_processes,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+    return _process_pool
+
+def shutdown_process_pool():
+    """프로세스 풀 종료"""
+    global _process_pool
+
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+async def run_cpu_bound(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    CPU 작업을 프로세스 풀에서 실행 (풀 비활성화 시 기본 스레드 풀)
+
+    Args:
+        func: 모듈 최상위에 정의된(pickle 가능한) 함수
+        *args: 함수 인자
+
+    Returns:
+        함수 실행 결과
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(init_process_pool(), functools.partial(func, *args))
+
+async def gather_or_cancel(aws: Iterable[Awaitable[Any]]) -> List[Any]:
+    """
+    여러 작업을 동시 실행하고 하나라도 실패하면 나머지 작업을 취소 (입력 순서 유지)
+
+    asyncio.gather와 달리 실패 후에도 남은 작업이 API 호출/진행률 콜백을 계속하지 않도록
+    취소하고, 취소가 끝날 때까지 기다린 뒤 처음 실패한 작업의 예외를 다시 발생시킨다.
+
+    Args:
+        aws: 실행할 코루틴/awaitable 목록
+
+    Returns:
+        입력 순서와 동일한 결과 목록
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    if not tasks:
+        return []
+
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+
+        for task in tasks:
+            if task.done() and not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+
+        return [task.result() for task in tasks]
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+def page_ranges(page_count: int, pages_per_task: int = None) -> List[Tuple[int, int]]:
+    """
+    페이지를 워커에 나눠줄 [start, end) 범위 목록으로 분할
+
+    Args:
+        page_count: 전체 페이지 수
+        pages_per_task: 워커 작업당 페이지 수 (기본값: settings.pdf_pages_per_task)
+
+    Returns:
+        (start, end) 범위 목록
+    """
+    if pages_per_task is None:
+        pages_per_task = settings.pdf_pages_per_task
+    pages_per_task = max(1, pages_per_task)
+
+    return [
+        (start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    ]
@@ -0,0 +1,58 @@
+from typing import Callable, Awaitable, List, Optional
+import asyncio
+
+class JobQueue:
+    """프로세스 내 비동기 작업 큐 (작업 상태는 SQLite에 저장)"""
+
+    def __init__(self):
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[asyncio.Task] = []
+        self.handler: Optional[Callable[[str], Awaitable[None]]] = None
+
+    def start(self, handler: Callable[[str], Awaitable[None]], num_workers: int = 2):
+        """
+        워커 태스크 시작
+
+        Args:
+            handler: 작업 ID를 받아 처리하는 비동기 함수
+            num_workers: 동시에 처리할 작업 수
+        """
+        self.queue = asyncio.Queue()
+        self.handler = handler
+        self.workers = [
+            asyncio.create_task(self._worker())
+            for _ in range(max(1, num_workers))
+        ]
+
+    async def stop(self):
+        """워커 태스크 종료 (처리 중인 작업은 재시작 시 복구)"""
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        self.queue = None
+
+    def enqueue(self, job_id: str):
+        """
+        작업 추가
+
+        Args:
+            job_id: 작업 ID
+        """
+        if self.queue is None:
+            raise RuntimeError("작업 큐가 시작되지 않았습니다.")
+        self.queue.put_nowait(job_id)
+
+    async def _worker(self):
+        """큐에서 작업을 꺼내 순차 처리"""
+        while True:
+            job_id = await self.queue.get()
+            try:
+                await self.handler(job_id)
+            except Exception as e:
+                print(f"⚠️  작업 처리 실패 ({job_id}): {e}")
+            finally:
+                self.queue.task_done()
+
+# 전역 작업 큐 인스턴스
+job_queue = JobQueue()
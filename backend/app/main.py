@@ -4,6 +4,11 @@ from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from app.core.database import init_db
 from app.core.config import settings
+from app.core.cache import cache
+from app.core.executor import init_process_pool, shutdown_process_pool
+from app.core.jobs import job_queue
+from app.services.job_service import run_pdf_job, recover_pending_jobs
+from app.services.openai_service import init_openai_client, close_openai_client
 from app.api.v1 import pdf, summary, quiz, qa, analytics
 import asyncio
 import time
@@ -14,8 +19,24 @@ async def lifespan(app: FastAPI):
     # 시작 시: 데이터베이스 초기화
     init_db()
     print("✅ 데이터베이스 초기화 완료")
+
+    # 시작 시: 공유 OpenAI 클라이언트 (커넥션 풀) 생성
+    if settings.openai_api_key:
+        init_openai_client()
+        print("✅ OpenAI 클라이언트 초기화 완료")
+
+    # 시작 시: PDF 처리용 프로세스 풀 생성
+    init_process_pool()
+
+    # 시작 시: PDF 처리 작업 큐 시작 (끝나지 않은 작업 복구)
+    job_queue.start(run_pdf_job, settings.job_workers)
+    for job_id in recover_pending_jobs():
+        job_queue.enqueue(job_id)
     yield
-    # 종료 시: 필요한 정리 작업 (현재는 없음)
+    # 종료 시: 작업 큐, 공유 OpenAI 클라이언트 및 프로세스 풀 종료
+    await job_queue.stop()
+    await close_openai_client()
+    shutdown_process_pool()
     print("🔚 애플리케이션 종료")
 
 # FastAPI 앱 생성
@@ -36,6 +57,62 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# 멀티파트 경계/폼 필드 등 파일 외 본문 여유분
+UPLOAD_FORM_OVERHEAD = 64 * 1024
+
+class UploadSizeLimitMiddleware:
+    """
+    PDF 업로드 요청 본문 크기 제한 (ASGI)
+
+    FastAPI는 핸들러 실행 전에 멀티파트 본문 전체를 임시 파일로 받아 두므로, 핸들러에서의
+    크기 검사는 큰 파일을 이미 다 받은 뒤에야 동작한다. 폼 파싱 전에 Content-Length로 거절하고,
+    길이 헤더가 없는 요청은 받은 바이트 수가 한도를 넘는 즉시 응답 후 수신을 중단한다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.paths = {settings.api_prefix + "/pdf/upload", settings.api_prefix + "/pdf/jobs"}
+        self.limit = settings.max_upload_size + UPLOAD_FORM_OVERHEAD
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        reject = JSONResponse(status_code=400, content={"detail": "파일 크기가 너무 큽니다. (최대 50MB)"})
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.limit:
+            await reject(scope, receive, send)
+            return
+
+        received = 0
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            message = await receive()
+            if message["type"] == "http.request" and not rejected:
+                received += len(message.get("body", b""))
+                if received > self.limit:
+                    rejected = True
+                    await reject(scope, receive, send)
+                    # 폼 파싱을 중단시키기 위해 연결 종료로 전달
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            if not rejected:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
+
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # 타임아웃 미들웨어 설정
 @app.middleware("http")
 async def timeout_middleware(request: Request, call_next):
@@ -74,5 +151,6 @@ async def health_check():
     return {
         "status": "healthy",
         "database": "connected",
-        "cache": "active"
+        "cache": "active",
+        "cache_stats": cache.stats()
     }
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Boolean, DateTime, JSON, Float
+from sqlalchemy import Column, String, Text, Boolean, DateTime, JSON, Float, Integer, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 import uuid
@@ -56,3 +56,123 @@ class WrongAnswer(Base):
     correct_answer = Column(Text)  # 정답
     explanation = Column(Text)  # 해설
     created_at = Column(DateTime, server_default=func.now())
+
+class ProcessingJob(Base):
+    """PDF 백그라운드 처리 작업 모델"""
+    __tablename__ = "processing_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    document_id = Column(String, nullable=False)  # 완료 시 생성될 문서 ID
+    filename = Column(String, nullable=False)
+    file_path = Column(String, nullable=False)
+    use_ocr = Column(Boolean, default=False)
+    analyze_images = Column(Boolean, default=False)
+    content_hash = Column(String)  # 업로드 파일 SHA-256 (중복 업로드 재사용)
+    status = Column(String, nullable=False, default="pending")  # pending / processing / completed / failed
+    processed_pages = Column(Integer, default=0)  # 처리된 페이지 수
+    total_pages = Column(Integer, default=0)  # 전체 페이지 수
+    error = Column(Text)  # 실패 사유
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class DocumentFingerprint(Base):
+    """업로드 파일 내용 해시 → 처리된 문서 매핑 (중복 업로드 재사용)"""
+    __tablename__ = "document_fingerprints"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    content_hash = Column(String, nullable=False, index=True)  # 파일 SHA-256
+    use_ocr = Column(Boolean, default=False)
+    analyze_images = Column(Boolean, default=False)
+    ocr_mode = Column(String)  # OCR 사용 시 처리 당시 settings.ocr_mode (auto / all), 미사용 시 NULL
+    document_id = Column(String, nullable=False)  # 처리 결과를 가진 문서 ID
+    created_at = Column(DateTime, server_default=func.now())
+
+class DocumentChunk(Base):
+    """이전 형식의 문서 청크 모델 (청크 본문 사본, 더 이상 저장하지 않고 색인을 다시 만들 때 정리만 함)"""
+    __tablename__ = "document_chunks"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    document_id = Column(String, nullable=False, index=True)
+    chunk_size = Column(Integer, nullable=False)  # 청킹 기준 최대 문자 수
+    chunk_index = Column(Integer, nullable=False)  # 문서 내 청크 순서
+    content = Column(Text, nullable=False)  # 청크 텍스트
+    term_count = Column(Integer)  # 검색어 분석 후 토큰 수 (BM25 문서 길이)
+    created_at = Column(DateTime, server_default=func.now())
+
+class ChunkTermCount(Base):
+    """청크 길이 모델 (BM25 문서 길이, 청크 본문은 ChunkSpan 오프셋으로 Document.content에서 조회)"""
+    __tablename__ = "chunk_term_counts"
+    __table_args__ = (
+        Index("ix_chunk_term_counts_lookup", "document_id", "chunk_size", "chunk_index"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    document_id = Column(String, nullable=False)
+    chunk_size = Column(Integer, nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    term_count = Column(Integer, nullable=False)  # 검색어 분석 후 토큰 수
+
+class ChunkPosting(Base):
+    """청크 역색인 모델 (검색어 → 청크, BM25 점수 계산용)"""
+    __tablename__ = "chunk_postings"
+    __table_args__ = (
+        Index("ix_chunk_postings_lookup", "document_id", "chunk_size", "term"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    document_id = Column(String, nullable=False)
+    chunk_size = Column(Integer, nullable=False)
+    term = Column(String, nullable=False)  # 검색어 (단어 또는 한글 2-gram)
+    chunk_index = Column(Integer, nullable=False)
+    tf = Column(Integer, nullable=False)  # 청크 내 출현 횟수
+
+class ChunkIndexStats(Base):
+    """청크 역색인 통계 모델 (문서·청크 크기별 청크 수/평균 길이, 색인 생성 시 1회 저장)"""
+    __tablename__ = "chunk_index_stats"
+    __table_args__ = (
+        Index("ix_chunk_index_stats_lookup", "document_id", "chunk_size"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    document_id = Column(String, nullable=False)
+    chunk_size = Column(Integer, nullable=False)
+    num_chunks = Column(Integer, nullable=False)  # 청크 수 (BM25 N)
+    avg_term_count = Column(Float, nullable=False)  # 평균 청크 길이 (BM25 avgdl)
+    index_version = Column(Integer, nullable=False)  # 색인 생성 시 분석기/저장 형식 버전
+
+class DocumentKeypoints(Base):
+    """문서 키포인트 모델 (퀴즈 생성 근거, 문서별 1회 추출 후 재사용)"""
+    __tablename__ = "document_keypoints"
+
+    document_id = Column(String, primary_key=True)
+    keypoints = Column(Text, nullable=False)  # 통합 키포인트 (15~25개 불릿)
+    created_at = Column(DateTime, server_default=func.now())
+
+class ChunkSpan(Base):
+    """문서 청크 오프셋 모델 (요약/퀴즈/Q&A 공용, 수집 시 청크 크기별 1회 생성)"""
+    __tablename__ = "chunk_spans"
+    __table_args__ = (
+        Index("ix_chunk_spans_lookup", "document_id", "chunk_size", "chunk_index"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    document_id = Column(String, nullable=False)
+    chunk_size = Column(Integer, nullable=False)  # 청킹 기준 최대 문자 수
+    chunk_index = Column(Integer, nullable=False)  # 문서 내 청크 순서
+    start_offset = Column(Integer, nullable=False)  # Document.content 내 시작 위치
+    end_offset = Column(Integer, nullable=False)  # Document.content 내 끝 위치 (미포함)
+
+class DocumentPage(Base):
+    """문서 페이지 모델 (페이지별 텍스트와 Document.content 내 위치)"""
+    __tablename__ = "document_pages"
+    __table_args__ = (
+        Index("ix_document_pages_lookup", "document_id", "page_number"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    document_id = Column(String, nullable=False)
+    page_number = Column(Integer, nullable=False)  # 1부터 시작
+    text = Column(Text, nullable=False)
+    start_offset = Column(Integer, nullable=False)  # Document.content 내 시작 위치
+    end_offset = Column(Integer, nullable=False)  # Document.content 내 끝 위치 (미포함)
+    ocr_used = Column(Boolean, default=False)
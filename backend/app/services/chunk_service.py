@@ -0,0 +1,283 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from app.models.models import Document, DocumentChunk, ChunkPosting, ChunkIndexStats, ChunkSpan, ChunkTermCount
+from app.services.chunk_store import get_document_chunks
+from typing import List, Dict, Tuple, Optional
+from collections import Counter
+import math
+import re
+
+# BM25 파라미터
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# 검색어 분석 방식이나 색인 저장 형식이 바뀌면 올려서 기존 색인(역색인/벡터)을 다시 만들게 함
+INDEX_VERSION = 3
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+# 단어를 한글 구간과 그 외(영문/숫자) 구간으로 분리 ("TCP는" → "tcp", "는")
+_SCRIPT_RUN_RE = re.compile(r"[가-힣]+|[^가-힣]+")
+
+def analyze(text: str) -> List[str]:
+    """
+    검색어 분석 (소문자 단어 + 한글 구간은 글자 2-gram)
+
+    한국어는 조사가 붙어 단어 단위 일치가 잘 안 되므로("파이썬은" vs "파이썬")
+    한글 구간은 글자 2-gram으로 나눠 부분 일치를 허용한다. 영문/숫자 구간은
+    나누지 않아 "TCP는"과 "TCP"가 같은 검색어 "tcp"로 일치한다.
+
+    Args:
+        text: 분석할 텍스트
+
+    Returns:
+        검색어 목록 (중복 포함)
+    """
+    terms = []
+    for word in _WORD_RE.findall(text.lower()):
+        for run in _SCRIPT_RUN_RE.findall(word):
+            if len(run) > 2 and "가" <= run[0] <= "힣":
+                terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+            else:
+                terms.append(run)
+    return terms
+
+def _bm25(tf: int, df: int, doc_len: int, num_chunks: int, avg_len: float) -> float:
+    """BM25 단일 검색어 점수"""
+    idf = math.log(1 + (num_chunks - df + 0.5) / (df + 0.5))
+    norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * doc_len / max(avg_len, 1e-9))
+    return idf * tf * (BM25_K1 + 1) / norm
+
+def build_chunk_index(
+    db: Session,
+    document_id: str,
+    full_text: str,
+    chunk_size: int
+) -> int:
+    """
+    청크 길이와 BM25 역색인 생성/저장 (현재 버전으로 만든 색인이 있으면 생략)
+
+    청크 본문은 저장하지 않고 수집 시 만든 ChunkSpan 오프셋으로 Document.content에서 잘라 쓴다.
+
+    Args:
+        db: 데이터베이스 세션
+        document_id: 문서 ID
+        full_text: 전체 문서 텍스트
+        chunk_size: 청킹 기준 최대 문자 수
+
+    Returns:
+        청크 수
+    """
+    stats = db.query(ChunkIndexStats).filter(
+        ChunkIndexStats.document_id == document_id,
+        ChunkIndexStats.chunk_size == chunk_size
+    ).first()
+
+    if stats and stats.index_version == INDEX_VERSION:
+        return stats.num_chunks
+
+    # 이전 버전 색인(청크 본문 사본 포함)과 역색인 항목 정리 (다시 만들 때 tf/df 중복 방지)
+    for model in (DocumentChunk, ChunkTermCount, ChunkPosting, ChunkIndexStats):
+        db.query(model).filter(
+            model.document_id == document_id,
+            model.chunk_size == chunk_size
+        ).delete()
+
+    # 수집 시 저장된 청크 오프셋 재사용
+    chunks = get_document_chunks(db, document_id, full_text or "", chunk_size)
+    postings = []
+    total_terms = 0
+
+    for index, chunk in enumerate(chunks):
+        terms = analyze(chunk)
+        total_terms += len(terms)
+
+        db.add(ChunkTermCount(
+            document_id=document_id,
+            chunk_size=chunk_size,
+            chunk_index=index,
+            term_count=len(terms)
+        ))
+
+        postings.extend(
+            {
+                "document_id": document_id,
+                "chunk_size": chunk_size,
+                "term": term,
+                "chunk_index": index,
+                "tf": tf
+            }
+            for term, tf in Counter(terms).items()
+        )
+
+    if postings:
+        db.execute(ChunkPosting.__table__.insert(), postings)
+
+    # 질문마다 전체 청크를 집계하지 않도록 N/평균 길이를 미리 저장
+    db.add(ChunkIndexStats(
+        document_id=document_id,
+        chunk_size=chunk_size,
+        num_chunks=len(chunks),
+        avg_term_count=total_terms / len(chunks) if chunks else 0.0,
+        index_version=INDEX_VERSION
+    ))
+    db.commit()
+
+    return len(chunks)
+
+def bm25_scores(
+    db: Session,
+    document_id: str,
+    chunk_size: int,
+    question: str
+) -> Dict[int, float]:
+    """
+    질문 검색어의 역색인 항목만 조회해 청크별 BM25 점수 계산
+
+    Args:
+        db: 데이터베이스 세션
+        document_id: 문서 ID
+        chunk_size: 청킹 기준 최대 문자 수
+        question: 질문
+
+    Returns:
+        {청크 인덱스: 점수} (검색어가 하나라도 일치한 청크만)
+    """
+    stats = db.query(ChunkIndexStats).filter(
+        ChunkIndexStats.document_id == document_id,
+        ChunkIndexStats.chunk_size == chunk_size
+    ).first()
+
+    terms = set(analyze(question))
+    scores: Dict[int, float] = {}
+
+    if not stats or not stats.num_chunks or not terms:
+        return scores
+
+    rows = db.query(ChunkPosting.term, ChunkPosting.chunk_index, ChunkPosting.tf).filter(
+        ChunkPosting.document_id == document_id,
+        ChunkPosting.chunk_size == chunk_size,
+        ChunkPosting.term.in_(terms)
+    ).all()
+
+    df = Counter(term for term, _, _ in rows)
+    hit_indexes = {chunk_index for _, chunk_index, _ in rows}
+
+    lengths = dict(db.query(ChunkTermCount.chunk_index, ChunkTermCount.term_count).filter(
+        ChunkTermCount.document_id == document_id,
+        ChunkTermCount.chunk_size == chunk_size,
+        ChunkTermCount.chunk_index.in_(hit_indexes)
+    ).all()) if hit_indexes else {}
+
+    for term, chunk_index, tf in rows:
+        scores[chunk_index] = scores.get(chunk_index, 0.0) + _bm25(
+            tf, df[term], lengths.get(chunk_index) or 0, stats.num_chunks, stats.avg_term_count
+        )
+
+    return scores
+
+def load_chunks(
+    db: Session,
+    document_id: str,
+    chunk_size: int,
+    indexes: Optional[List[int]] = None
+) -> List[str]:
+    """
+    청크 텍스트 조회 (ChunkSpan 오프셋으로 Document.content의 해당 구간만 DB에서 잘라 읽음)
+
+    Args:
+        db: 데이터베이스 세션
+        document_id: 문서 ID
+        chunk_size: 청킹 기준 최대 문자 수
+        indexes: 조회할 청크 인덱스 (순서 유지, None이면 전체를 문서 순서로)
+
+    Returns:
+        청크 텍스트 목록
+    """
+    # SQL substr는 1부터 시작하는 문자 단위 위치
+    query = db.query(
+        ChunkSpan.chunk_index,
+        func.substr(Document.content, ChunkSpan.start_offset + 1, ChunkSpan.end_offset - ChunkSpan.start_offset)
+    ).join(Document, Document.id == ChunkSpan.document_id).filter(
+        ChunkSpan.document_id == document_id,
+        ChunkSpan.chunk_size == chunk_size
+    )
+
+    if indexes is None:
+        return [content for _, content in query.order_by(ChunkSpan.chunk_index).all()]
+
+    contents = dict(query.filter(ChunkSpan.chunk_index.in_(indexes)).all())
+    return [contents[i] for i in indexes if i in contents]
+
+def search_chunks(
+    db: Session,
+    document_id: str,
+    chunk_size: int,
+    question: str,
+    top_k: int = 4
+) -> List[str]:
+    """
+    BM25로 질문과 관련된 상위 청크 검색 (질문 검색어의 역색인 항목만 조회)
+
+    Args:
+        db: 데이터베이스 세션
+        document_id: 문서 ID
+        chunk_size: 청킹 기준 최대 문자 수
+        question: 질문
+        top_k: 반환할 청크 수
+
+    Returns:
+        점수 내림차순 청크 텍스트 목록
+    """
+    scores = bm25_scores(db, document_id, chunk_size, question)
+
+    # 일치하는 검색어가 없으면 문서 앞부분 청크 사용
+    top_indexes = sorted(scores, key=lambda i: (-scores[i], i))[:top_k]
+    if not top_indexes:
+        top_indexes = list(range(top_k))
+
+    return load_chunks(db, document_id, chunk_size, top_indexes)
+
+def rank_indexes(chunks: List[str], question: str) -> List[int]:
+    """
+    저장된 색인 없이 청크 목록을 메모리에서 BM25로 순위화
+
+    Args:
+        chunks: 청크 텍스트 목록
+        question: 질문
+
+    Returns:
+        점수 내림차순 청크 인덱스 목록 (동점이면 문서 순서)
+    """
+    if not chunks:
+        return []
+
+    terms = set(analyze(question))
+    chunk_terms = [Counter(analyze(chunk)) for chunk in chunks]
+    avg_len = sum(sum(c.values()) for c in chunk_terms) / len(chunks)
+    df = Counter(term for c in chunk_terms for term in c if term in terms)
+
+    scored: List[Tuple[float, int]] = []
+    for index, counts in enumerate(chunk_terms):
+        doc_len = sum(counts.values())
+        score = sum(
+            _bm25(counts[term], df[term], doc_len, len(chunks), avg_len)
+            for term in terms if term in counts
+        )
+        scored.append((score, index))
+
+    scored.sort(key=lambda x: (-x[0], x[1]))
+    return [index for _, index in scored]
+
+def rank_chunks(chunks: List[str], question: str, top_k: int = 4) -> List[str]:
+    """
+    저장된 색인 없이 청크 목록을 메모리에서 BM25로 순위화
+
+    Args:
+        chunks: 청크 텍스트 목록
+        question: 질문
+        top_k: 반환할 청크 수
+
+    Returns:
+        점수 내림차순 청크 텍스트 목록
+    """
+    return [chunks[index] for index in rank_indexes(chunks, question)[:top_k]]
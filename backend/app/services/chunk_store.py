@@ -0,0 +1,129 @@
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.models import ChunkSpan
+from app.services.chunker import iter_segments, pack_segments, segment_limit
+from typing import List, Iterable, Optional, Tuple
+
+def chunk_granularities() -> List[int]:
+    """
+    수집 시 미리 만들어 둘 청크 크기 목록
+
+    Returns:
+        요약 / 퀴즈 키포인트 / Q&A 검색용 청크 크기 (중복 제거, 오름차순)
+    """
+    return sorted({settings.chunk_size, settings.quiz_chunk_size, settings.qa_chunk_size})
+
+def build_chunk_store(
+    db: Session,
+    document_id: str,
+    content: str,
+    chunk_sizes: Iterable[int] = None
+) -> int:
+    """
+    문서를 한 번 문장 분할한 뒤 청크 크기별 오프셋 저장 (이미 있는 크기는 생략, commit은 호출자가 수행)
+
+    Args:
+        db: 데이터베이스 세션
+        document_id: 문서 ID
+        content: 문서 텍스트 (Document.content)
+        chunk_sizes: 만들 청크 크기 목록 (기본값: chunk_granularities())
+
+    Returns:
+        새로 저장한 청크 수
+    """
+    if chunk_sizes is None:
+        chunk_sizes = chunk_granularities()
+
+    existing = {
+        size for (size,) in db.query(ChunkSpan.chunk_size).filter(
+            ChunkSpan.document_id == document_id
+        ).distinct().all()
+    }
+    sizes = sorted(set(chunk_sizes) - existing)
+
+    if not sizes or not content:
+        return 0
+
+    # 가장 작은 청크 크기 기준으로 한 번만 문장 분할 (큰 청크에도 그대로 사용 가능)
+    segments = list(iter_segments(content, segment_limit(sizes[0])))
+
+    count = 0
+    for size in sizes:
+        spans = pack_segments(content, segments, size, overlap=settings.chunk_overlap)
+        for index, (start, end) in enumerate(spans):
+            db.add(ChunkSpan(
+                document_id=document_id,
+                chunk_size=size,
+                chunk_index=index,
+                start_offset=start,
+                end_offset=end
+            ))
+            count += 1
+
+    return count
+
+def get_chunk_spans(
+    db: Session,
+    document_id: str,
+    chunk_size: int,
+    char_range: Tuple[int, int]
+) -> List[Tuple[int, int, int]]:
+    """
+    문자 구간과 겹치는 청크 오프셋 조회
+
+    Args:
+        db: 데이터베이스 세션
+        document_id: 문서 ID
+        chunk_size: 청크 크기
+        char_range: 문자 구간 (start, end)
+
+    Returns:
+        문서 순서의 (청크 인덱스, 시작 위치, 끝 위치) 목록
+    """
+    range_start, range_end = char_range
+    return db.query(ChunkSpan.chunk_index, ChunkSpan.start_offset, ChunkSpan.end_offset).filter(
+        ChunkSpan.document_id == document_id,
+        ChunkSpan.chunk_size == chunk_size,
+        ChunkSpan.end_offset > range_start,
+        ChunkSpan.start_offset < range_end
+    ).order_by(ChunkSpan.chunk_index).all()
+
+def get_document_chunks(
+    db: Session,
+    document_id: str,
+    content: str,
+    chunk_size: int,
+    char_range: Optional[Tuple[int, int]] = None
+) -> List[str]:
+    """
+    저장된 오프셋으로 문서 청크 조회 (수집 전에 만들어진 문서는 이때 생성)
+
+    Args:
+        db: 데이터베이스 세션
+        document_id: 문서 ID
+        content: 문서 텍스트 (Document.content)
+        chunk_size: 청크 크기
+        char_range: 이 문자 구간과 겹치는 청크만 구간 안으로 잘라서 반환 (페이지 범위 요청용)
+
+    Returns:
+        문서 순서의 청크 텍스트 목록
+    """
+    query = db.query(ChunkSpan.start_offset, ChunkSpan.end_offset).filter(
+        ChunkSpan.document_id == document_id,
+        ChunkSpan.chunk_size == chunk_size
+    )
+
+    if not query.first():
+        if not content:
+            return []
+        build_chunk_store(db, document_id, content, [chunk_size])
+        db.commit()
+
+    if char_range is None:
+        return [content[start:end] for start, end in query.order_by(ChunkSpan.chunk_index).all()]
+
+    range_start, range_end = char_range
+    spans = get_chunk_spans(db, document_id, chunk_size, char_range)
+
+    chunks = [content[max(start, range_start):min(end, range_end)].strip() for _, start, end in spans]
+    return [chunk for chunk in chunks if chunk]
@@ -0,0 +1,201 @@
+"""
+텍스트 청킹 엔진
+
+문단 → 문장 단위로 경계를 찾고 (너무 긴 문장은 공백 위치 우선으로 강제 분할),
+문장을 순서대로 채워 최대 문자 수/토큰 수를 넘지 않는 청크를 만든다.
+모든 단계가 제너레이터라 텍스트 길이에 선형이며, 청크는 원문 오프셋 (start, end)로도 얻을 수 있다.
+
+토큰 수는 외부 토크나이저 없이 문자 종류별 규칙으로 보수적으로 추정한다.
+(한글 음절/한자/기호는 1토큰, 영문/숫자 연속 구간은 4자당 1토큰)
+"""
+from app.core.config import settings
+from typing import Iterable, Iterator, List, Tuple
+from collections import deque
+import math
+import re
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+|[^\sA-Za-z0-9]")
+_PARAGRAPH_BREAK = re.compile(r"\n[^\S\n]*\n\s*")
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?。])\s+|\n\s*")
+
+def estimate_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수 추정 (실제 토크나이저보다 약간 크게 잡음, 항상 문자 수 이하)
+
+    Args:
+        text: 텍스트
+
+    Returns:
+        추정 토큰 수
+    """
+    tokens = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        piece = match.group()
+        tokens += math.ceil(len(piece) / 4) if piece[0].isascii() and piece[0].isalnum() else 1
+    return tokens
+
+def split_sentences(text: str) -> List[str]:
+    """
+    문장 단위 분할 (문장부호 뒤 공백 또는 줄바꿈 기준)
+
+    Args:
+        text: 텍스트
+
+    Returns:
+        공백이 아닌 문장 목록
+    """
+    return [s.strip() for s in _SENTENCE_BREAK.split(text) if s.strip()]
+
+def _strip_span(text: str, start: int, end: int) -> Tuple[int, int]:
+    """구간 앞뒤 공백 제외"""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+def _split_by(pattern: re.Pattern, text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    """text[start:end]를 구분 패턴 기준으로 나눈 공백 아닌 구간"""
+    pos = start
+    for match in pattern.finditer(text, start, end):
+        s, e = _strip_span(text, pos, match.start())
+        if s < e:
+            yield s, e
+        pos = match.end()
+
+    s, e = _strip_span(text, pos, end)
+    if s < e:
+        yield s, e
+
+def _hard_split(text: str, start: int, end: int, limit: int) -> Iterator[Tuple[int, int]]:
+    """limit보다 긴 구간을 공백 위치 우선으로 강제 분할 (공백이 없으면 limit 위치에서 자름)"""
+    while end - start > limit:
+        cut = start + limit
+        space = max(text.rfind(" ", start + limit // 2, cut), text.rfind("\n", start + limit // 2, cut))
+        if space > start:
+            cut = space
+
+        s, e = _strip_span(text, start, cut)
+        if s < e:
+            yield s, e
+        start, end = _strip_span(text, cut, end)
+
+    if start < end:
+        yield start, end
+
+def iter_segments(text: str, limit: int) -> Iterator[Tuple[int, int]]:
+    """
+    청킹 기본 단위(문장) 구간 생성
+
+    Args:
+        text: 텍스트
+        limit: 단위 하나의 최대 문자 수 (넘으면 강제 분할)
+
+    Yields:
+        원문 오프셋 (start, end)
+    """
+    for p_start, p_end in _split_by(_PARAGRAPH_BREAK, text, 0, len(text)):
+        for s_start, s_end in _split_by(_SENTENCE_BREAK, text, p_start, p_end):
+            yield from _hard_split(text, s_start, s_end, limit)
+
+def segment_limit(max_chars: int, max_tokens: int = None) -> int:
+    """문장 단위 하나의 최대 문자 수 (토큰 예산도 넘지 않도록, 추정 토큰 수 ≤ 문자 수)"""
+    return max_chars if max_tokens is None else max(1, min(max_chars, max_tokens))
+
+def pack_segments(
+    text: str,
+    segments: Iterable[Tuple[int, int]],
+    max_chars: int,
+    overlap: int = 0,
+    max_tokens: int = None
+) -> Iterator[Tuple[int, int]]:
+    """
+    문장 구간을 순서대로 채워 청크 구간 생성
+    (같은 문장 분할 결과로 여러 청크 크기를 만들 때 재사용, 문장은 segment_limit 이하여야 함)
+
+    Args:
+        text: 원문 텍스트
+        segments: iter_segments 결과
+        max_chars: 청크 최대 문자 수
+        overlap: 이전 청크 끝에서 다음 청크로 이어 붙일 최대 문자 수 (문장 단위)
+        max_tokens: 청크 최대 추정 토큰 수 (None이면 제한 없음)
+
+    Yields:
+        원문 오프셋 (start, end)
+    """
+    units = deque()  # (start, end, tokens)
+    tokens = 0
+
+    def overflows(end: int, extra: int) -> bool:
+        return end - units[0][0] > max_chars or (max_tokens is not None and tokens + extra > max_tokens)
+
+    for start, end in segments:
+        unit_tokens = estimate_tokens(text[start:end]) if max_tokens is not None else 0
+
+        if units and overflows(end, unit_tokens):
+            yield units[0][0], units[-1][1]
+
+            # 겹침 구간으로 남길 끝부분 문장만 유지 (새 문장이 들어갈 자리는 항상 확보)
+            while units and (units[-1][1] - units[0][0] > overlap or overflows(end, unit_tokens)):
+                tokens -= units.popleft()[2]
+
+        units.append((start, end, unit_tokens))
+        tokens += unit_tokens
+
+    if units:
+        yield units[0][0], units[-1][1]
+
+def iter_chunk_spans(
+    text: str,
+    max_chars: int = None,
+    overlap: int = None,
+    max_tokens: int = None
+) -> Iterator[Tuple[int, int]]:
+    """
+    문장 경계를 지키며 청크 구간 생성
+
+    Args:
+        text: 분할할 텍스트
+        max_chars: 청크 최대 문자 수 (기본값: settings.chunk_size)
+        overlap: 이전 청크 끝에서 다음 청크로 이어 붙일 최대 문자 수 (문장 단위, 기본값: settings.chunk_overlap)
+        max_tokens: 청크 최대 추정 토큰 수 (None이면 제한 없음)
+
+    Yields:
+        원문 오프셋 (start, end)
+    """
+    if max_chars is None:
+        max_chars = settings.chunk_size
+    if overlap is None:
+        overlap = settings.chunk_overlap
+
+    segments = iter_segments(text or "", segment_limit(max_chars, max_tokens))
+    yield from pack_segments(text, segments, max_chars, overlap, max_tokens)
+
+def iter_chunks(
+    text: str,
+    max_chars: int = None,
+    overlap: int = None,
+    max_tokens: int = None
+) -> Iterator[str]:
+    """
+    문장 경계를 지키며 청크 텍스트 생성 (인자는 iter_chunk_spans와 같음)
+
+    Yields:
+        청크 텍스트
+    """
+    for start, end in iter_chunk_spans(text, max_chars, overlap, max_tokens):
+        yield text[start:end]
+
+def chunk_text(
+    text: str,
+    max_chars: int = None,
+    overlap: int = None,
+    max_tokens: int = None
+) -> List[str]:
+    """
+    텍스트를 청크 목록으로 분할 (인자는 iter_chunk_spans와 같음)
+
+    Returns:
+        청크 목록
+    """
+    return list(iter_chunks(text, max_chars, overlap, max_tokens))
@@ -0,0 +1,170 @@
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.models import Document, DocumentFingerprint, DocumentPage
+from typing import Optional, List, Tuple
+
+def _fingerprint_ocr_mode(use_ocr: bool) -> Optional[str]:
+    """지문에 기록할 OCR 모드 (auto/all 결과가 다르므로 구분, OCR 미사용 시 None)"""
+    return settings.ocr_mode if use_ocr else None
+
+def find_processed_document(
+    db: Session,
+    content_hash: str,
+    use_ocr: bool,
+    analyze_images: bool
+) -> Optional[Document]:
+    """
+    같은 파일 내용을 같은 옵션(OCR 모드 포함)으로 처리한 기존 문서 조회
+
+    Args:
+        db: 데이터베이스 세션
+        content_hash: 업로드 파일의 SHA-256
+        use_ocr: OCR 사용 여부
+        analyze_images: 이미지/그래프 분석 여부
+
+    Returns:
+        재사용할 문서 또는 None
+    """
+    fingerprints = db.query(DocumentFingerprint).filter(
+        DocumentFingerprint.content_hash == content_hash,
+        DocumentFingerprint.use_ocr == use_ocr,
+        DocumentFingerprint.analyze_images == analyze_images,
+        DocumentFingerprint.ocr_mode == _fingerprint_ocr_mode(use_ocr)
+    ).order_by(DocumentFingerprint.created_at.desc()).all()
+
+    for fingerprint in fingerprints:
+        document = db.query(Document).filter(Document.id == fingerprint.document_id).first()
+        # 빈 결과는 재사용하지 않음 (이전에 잘못 등록된 해시 포함)
+        if document and document.content:
+            return document
+
+    return None
+
+def register_fingerprint(
+    db: Session,
+    content_hash: str,
+    use_ocr: bool,
+    analyze_images: bool,
+    document_id: str
+):
+    """
+    처리 완료된 문서의 파일 내용 해시 등록 (commit은 호출자가 수행)
+
+    Args:
+        db: 데이터베이스 세션
+        content_hash: 업로드 파일의 SHA-256
+        use_ocr: OCR 사용 여부
+        analyze_images: 이미지/그래프 분석 여부
+        document_id: 처리 결과를 가진 문서 ID
+    """
+    db.add(DocumentFingerprint(
+        content_hash=content_hash,
+        use_ocr=use_ocr,
+        analyze_images=analyze_images,
+        ocr_mode=_fingerprint_ocr_mode(use_ocr),
+        document_id=document_id
+    ))
+
+def clone_document(
+    source: Document,
+    document_id: str,
+    filename: str,
+    file_path: Optional[str] = None
+) -> Document:
+    """
+    기존 처리 결과를 재사용하는 새 문서 생성
+
+    Args:
+        source: 재사용할 문서
+        document_id: 새 문서 ID
+        filename: 업로드 파일명
+        file_path: 파일 저장 경로 (기본값: 원본 문서 경로 공유)
+
+    Returns:
+        새 문서 (db.add는 호출자가 수행)
+    """
+    return Document(
+        id=document_id,
+        filename=filename,
+        content=source.content,
+        ocr_used=source.ocr_used,
+        image_analysis=source.image_analysis,
+        file_path=file_path or source.file_path
+    )
+
+def save_pages(db: Session, document_id: str, pages: List[dict]):
+    """
+    페이지별 텍스트/위치 저장 (commit은 호출자가 수행)
+
+    Args:
+        db: 데이터베이스 세션
+        document_id: 문서 ID
+        pages: PDFService.process_document가 반환한 페이지 정보 목록
+    """
+    for page in pages:
+        db.add(DocumentPage(document_id=document_id, **page))
+
+def clone_pages(db: Session, source_id: str, document_id: str):
+    """
+    기존 문서의 페이지 정보를 새 문서로 복사 (commit은 호출자가 수행)
+
+    Args:
+        db: 데이터베이스 세션
+        source_id: 재사용할 문서 ID
+        document_id: 새 문서 ID
+    """
+    pages = db.query(DocumentPage).filter(DocumentPage.document_id == source_id).all()
+
+    for page in pages:
+        db.add(DocumentPage(
+            document_id=document_id,
+            page_number=page.page_number,
+            text=page.text,
+            start_offset=page.start_offset,
+            end_offset=page.end_offset,
+            ocr_used=page.ocr_used
+        ))
+
+def resolve_page_range(
+    db: Session,
+    document_id: str,
+    page_start: Optional[int] = None,
+    page_end: Optional[int] = None
+) -> Optional[Tuple[int, int]]:
+    """
+    페이지 범위를 Document.content 내 문자 구간으로 변환
+
+    Args:
+        db: 데이터베이스 세션
+        document_id: 문서 ID
+        page_start: 시작 페이지 (1부터, 포함, None이면 첫 페이지)
+        page_end: 끝 페이지 (포함, None이면 마지막 페이지)
+
+    Returns:
+        (시작 위치, 끝 위치) 또는 None (범위를 지정하지 않은 경우 = 문서 전체)
+
+    Raises:
+        ValueError: 범위가 잘못됐거나 페이지 정보가 없는 문서인 경우
+    """
+    if page_start is None and page_end is None:
+        return None
+
+    if (page_start is not None and page_start < 1) or (
+        page_start is not None and page_end is not None and page_end < page_start
+    ):
+        raise ValueError("페이지 범위가 올바르지 않습니다.")
+
+    query = db.query(DocumentPage.start_offset, DocumentPage.end_offset).filter(
+        DocumentPage.document_id == document_id
+    )
+    if page_start is not None:
+        query = query.filter(DocumentPage.page_number >= page_start)
+    if page_end is not None:
+        query = query.filter(DocumentPage.page_number <= page_end)
+
+    offsets = query.order_by(DocumentPage.page_number).all()
+
+    if not offsets:
+        raise ValueError("해당 범위의 페이지를 찾을 수 없습니다. (페이지 정보가 없는 문서이거나 범위를 벗어남)")
+
+    return offsets[0][0], offsets[-1][1]
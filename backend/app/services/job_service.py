@@ -0,0 +1,146 @@
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.models import Document, ProcessingJob
+from app.services.pdf_service import PDFService
+from app.services.document_service import (
+    find_processed_document, register_fingerprint, clone_document, save_pages, clone_pages
+)
+from app.services.chunk_store import build_chunk_store
+from app.services.retrieval_service import ensure_qa_indexes
+from datetime import datetime, timedelta, timezone
+from typing import List
+import os
+
+async def run_pdf_job(job_id: str):
+    """
+    PDF 처리 작업 실행 (작업 큐 워커에서 호출)
+
+    Args:
+        job_id: 작업 ID
+    """
+    db = SessionLocal()
+    try:
+        # 대기 중인 작업만 원자적으로 선점 (다른 워커/프로세스가 이미 가져갔으면 건너뜀)
+        claimed = db.query(ProcessingJob).filter(
+            ProcessingJob.id == job_id,
+            ProcessingJob.status == "pending"
+        ).update(
+            {"status": "processing", "processed_pages": 0, "error": None},
+            synchronize_session=False
+        )
+        db.commit()
+
+        if not claimed:
+            return
+
+        job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
+
+        def on_progress(done: int, total: int):
+            job.processed_pages = done
+            job.total_pages = total
+            db.commit()
+
+        # 대기 중에 같은 파일이 먼저 처리됐으면 결과 재사용
+        if job.content_hash:
+            source = find_processed_document(db, job.content_hash, job.use_ocr, job.analyze_images)
+            if source:
+                # 같은 내용의 파일이 이미 있으면 이 작업의 업로드 파일은 삭제하고 기존 파일 공유
+                if source.file_path and source.file_path != job.file_path and os.path.exists(source.file_path):
+                    if os.path.exists(job.file_path):
+                        os.remove(job.file_path)
+                    job.file_path = source.file_path
+
+                document = clone_document(source, job.document_id, job.filename, job.file_path)
+                db.add(document)
+                clone_pages(db, source.id, document.id)
+                build_chunk_store(db, document.id, document.content)
+                job.status = "completed"
+                db.commit()
+                await ensure_qa_indexes(document.id)
+                return
+
+        try:
+            pdf_service = PDFService()
+            content, image_analysis, pages, failed_pages = await pdf_service.process_document(
+                job.file_path,
+                use_ocr=job.use_ocr,
+                analyze_images=job.analyze_images,
+                on_progress=on_progress
+            )
+
+            # 데이터베이스에 저장
+            document = Document(
+                id=job.document_id,
+                filename=job.filename,
+                content=content,
+                ocr_used=any(page["ocr_used"] for page in pages),  # 실제로 Vision 처리된 페이지가 있을 때만
+                image_analysis=image_analysis,
+                file_path=job.file_path
+            )
+
+            db.add(document)
+            save_pages(db, document.id, pages)
+            build_chunk_store(db, document.id, document.content)
+            # 일부 페이지 Vision 실패나 빈 결과는 다음 업로드가 재사용하지 않도록 등록하지 않음
+            if job.content_hash and content and not failed_pages:
+                register_fingerprint(db, job.content_hash, job.use_ocr, job.analyze_images, document.id)
+            job.status = "completed"
+            job.processed_pages = job.total_pages
+            db.commit()
+
+            # Q&A 검색 색인도 수집 시 생성 (실패해도 첫 질문 때 다시 시도)
+            try:
+                await ensure_qa_indexes(document.id)
+            except Exception as e:
+                print(f"⚠️  Q&A 색인 생성 실패 ({document.id}): {e}")
+
+        except Exception as e:
+            db.rollback()
+
+            # 문서가 이미 저장돼 있으면 (ID 충돌, 커밋 이후 오류) 결과와 파일을 그대로 둠
+            if db.query(Document).filter(Document.id == job.document_id).first():
+                job.status = "completed"
+                db.commit()
+                return
+
+            job.status = "failed"
+            job.error = f"PDF 처리 중 오류 발생: {str(e)}"
+            db.commit()
+
+            # 오류 발생 시 다른 문서가 쓰지 않는 파일만 삭제
+            in_use = db.query(Document).filter(Document.file_path == job.file_path).first()
+            if not in_use and os.path.exists(job.file_path):
+                os.remove(job.file_path)
+
+    finally:
+        db.close()
+
+def recover_pending_jobs() -> List[str]:
+    """
+    재시작 전에 끝나지 않은 작업 ID 조회
+
+    대기 중인 작업과, 진행 갱신이 job_stale_seconds 넘게 없는 처리 중 작업(중단된 작업)만
+    대기로 되돌린다. 다른 프로세스가 처리 중인 작업은 건드리지 않는다.
+
+    Returns:
+        다시 큐에 넣을 작업 ID 목록
+    """
+    db = SessionLocal()
+    try:
+        # updated_at은 DB 시각(CURRENT_TIMESTAMP, UTC) 기준
+        stale_before = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+            seconds=settings.job_stale_seconds
+        )
+
+        jobs = db.query(ProcessingJob).filter(
+            (ProcessingJob.status == "pending") |
+            ((ProcessingJob.status == "processing") & (ProcessingJob.updated_at < stale_before))
+        ).order_by(ProcessingJob.created_at).all()
+
+        for job in jobs:
+            job.status = "pending"
+        db.commit()
+
+        return [job.id for job in jobs]
+    finally:
+        db.close()
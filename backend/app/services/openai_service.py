@@ -1,20 +1,60 @@
-from openai import OpenAI, AuthenticationError, APIError, RateLimitError
+from openai import AsyncOpenAI, AuthenticationError, APIError, RateLimitError
 from app.core.config import settings
 from app.core.cache import cache
+from app.core.executor import gather_or_cancel
+from app.services.chunker import chunk_text
+from typing import Optional, Callable, Awaitable, Iterable, List, Any, AsyncIterator
+import asyncio
 import hashlib
+import httpx
 import json
 
+# 프로세스 전역 공유 클라이언트 (lifespan에서 생성/종료)
+_shared_client: Optional[AsyncOpenAI] = None
+
+def init_openai_client() -> AsyncOpenAI:
+    """
+    커넥션 풀을 공유하는 전역 AsyncOpenAI 클라이언트 생성
+
+    Returns:
+        공유 AsyncOpenAI 클라이언트
+    """
+    global _shared_client
+
+    if _shared_client is None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.openai_max_connections,
+                max_keepalive_connections=settings.openai_max_keepalive_connections,
+                keepalive_expiry=settings.openai_keepalive_expiry
+            ),
+            timeout=settings.openai_timeout
+        )
+        _shared_client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            timeout=settings.openai_timeout,
+            http_client=http_client
+        )
+
+    return _shared_client
+
+async def close_openai_client():
+    """전역 AsyncOpenAI 클라이언트 및 커넥션 풀 종료"""
+    global _shared_client
+
+    if _shared_client is not None:
+        await _shared_client.close()
+        _shared_client = None
+
 class OpenAIService:
     """OpenAI API 서비스"""
 
-    def __init__(self):
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
         if not settings.openai_api_key or settings.openai_api_key == "":
             raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
 
-        self.client = OpenAI(
-            api_key=settings.openai_api_key,
-            timeout=settings.openai_timeout
-        )
+        # 전달받은 클라이언트가 없으면 전역 공유 클라이언트 사용
+        self.client = client or init_openai_client()
         self.model = settings.gpt_model
         self.vision_model = settings.gpt_vision_model
 
@@ -54,7 +94,7 @@ class OpenAIService:
 
         # API 호출
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=model,
                 messages=messages,
                 temperature=temperature
@@ -75,11 +115,71 @@ class OpenAIService:
         except APIError as e:
             raise ValueError(f"OpenAI API 오류: {str(e)}")
 
+    async def chat_completion_stream(
+        self,
+        messages: list,
+        model: str = None,
+        temperature: float = 0.7,
+        use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        채팅 완성 API 스트리밍 호출 (생성되는 토큰을 바로 전달)
+
+        Args:
+            messages: 메시지 목록
+            model: 사용할 모델 (기본값: gpt-4o)
+            temperature: 온도 (0.0 ~ 2.0)
+            use_cache: 캐시 사용 여부 (chat_completion과 같은 캐시 키 사용)
+
+        Yields:
+            응답 텍스트 조각 (캐시 적중 시 전체 응답 한 번)
+        """
+        if model is None:
+            model = self.model
+
+        # 캐시 확인
+        if use_cache:
+            cache_key = self._generate_cache_key("chat", json.dumps(messages))
+            cached_response = cache.get(cache_key)
+            if cached_response:
+                yield cached_response
+                return
+
+        # API 호출
+        try:
+            stream = await self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                stream=True
+            )
+
+            pieces = []
+            async for event in stream:
+                if not event.choices:
+                    continue
+                delta = event.choices[0].delta.content
+                if delta:
+                    pieces.append(delta)
+                    yield delta
+
+            # 스트림이 끝까지 완료된 경우에만 캐시 저장
+            if use_cache:
+                cache.set(cache_key, "".join(pieces), expire=settings.cache_expire_seconds)
+
+        except AuthenticationError as e:
+            raise ValueError(f"OpenAI API 인증 실패: API 키가 유효하지 않습니다. .env 파일의 OPENAI_API_KEY를 확인하세요.")
+        except RateLimitError as e:
+            raise ValueError(f"OpenAI API 사용량 한도 초과: 잠시 후 다시 시도하세요.")
+        except APIError as e:
+            raise ValueError(f"OpenAI API 오류: {str(e)}")
+
     async def vision_completion(
         self,
         text: str,
         image_base64: str,
-        use_cache: bool = True
+        use_cache: bool = True,
+        mime_type: str = "image/png"
     ) -> str:
         """
         비전 완성 API 호출 (이미지 분석)
@@ -88,19 +188,25 @@ class OpenAIService:
             text: 프롬프트 텍스트
             image_base64: Base64 인코딩된 이미지
             use_cache: 캐시 사용 여부
+            mime_type: 이미지 MIME 타입
 
         Returns:
             응답 텍스트
         """
         # 캐시 확인
         if use_cache:
-            cache_key = self._generate_cache_key("vision", text + image_base64[:100])
+            # 이미지 전체 내용 + 모델 + 프롬프트로 키 생성 (앞부분만 쓰면 PNG 헤더가 같은 페이지끼리 충돌)
+            image_digest = hashlib.sha256(image_base64.encode()).hexdigest()
+            cache_key = self._generate_cache_key(
+                "vision",
+                json.dumps([self.vision_model, text, mime_type, image_digest], ensure_ascii=False)
+            )
             cached_response = cache.get(cache_key)
             if cached_response:
                 return cached_response
 
         # API 호출
-        response = self.client.chat.completions.create(
+        response = await self.client.chat.completions.create(
             model=self.vision_model,
             messages=[
                 {
@@ -110,7 +216,7 @@ class OpenAIService:
                         {
                             "type": "image_url",
                             "image_url": {
-                                "url": f"data:image/png;base64,{image_base64}"
+                                "url": f"data:{mime_type};base64,{image_base64}"
                             }
                         }
                     ]
@@ -126,33 +232,113 @@ class OpenAIService:
 
         return result
 
-    def chunk_text(self, text: str, max_chars: int = None) -> list:
+    async def map_concurrent(
+        self,
+        func: Callable[[Any], Awaitable[Any]],
+        items: Iterable[Any],
+        max_concurrency: int = None
+    ) -> List[Any]:
         """
-        텍스트를 청크로 분할
+        여러 항목에 비동기 함수를 동시 실행 (입력 순서 유지)
 
         Args:
-            text: 분할할 텍스트
-            max_chars: 최대 문자 수 (기본값: settings.chunk_size)
+            func: 항목별로 실행할 비동기 함수
+            items: 입력 항목 목록
+            max_concurrency: 최대 동시 실행 수 (기본값: settings.llm_max_concurrency)
 
         Returns:
-            청크 목록
+            입력 순서와 동일한 결과 목록
+        """
+        if max_concurrency is None:
+            max_concurrency = settings.llm_max_concurrency
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run(item):
+            async with semaphore:
+                return await func(item)
+
+        return await gather_or_cancel(run(item) for item in items)
+
+    async def tree_reduce(
+        self,
+        parts: List[str],
+        reduce_func: Callable[[str], Awaitable[str]],
+        max_chars: int = None
+    ) -> str:
+        """
+        부분 결과를 제한된 크기의 묶음으로 나눠 병렬 reduce 후 재귀적으로 통합
+
+        Args:
+            parts: 부분 결과 목록 (map 단계 출력)
+            reduce_func: 묶음 텍스트("\n\n" 연결)를 받아 통합 결과를 반환하는 비동기 함수
+            max_chars: 한 묶음의 최대 문자 수 (기본값: settings.reduce_max_chars)
+
+        Returns:
+            최종 통합 결과
+        """
+        joined = await self.reduce_to_final_batch(parts, reduce_func, max_chars)
+        if not joined:
+            return ""
+        return await reduce_func(joined)
+
+    async def reduce_to_final_batch(
+        self,
+        parts: List[str],
+        reduce_func: Callable[[str], Awaitable[str]],
+        max_chars: int = None
+    ) -> str:
+        """
+        마지막 reduce 한 번에 들어갈 묶음이 될 때까지 계층적으로 통합
+        (마지막 reduce를 스트리밍 등으로 호출자가 직접 수행할 때 사용)
+
+        Args:
+            parts: 부분 결과 목록 (map 단계 출력)
+            reduce_func: 묶음 텍스트("\n\n" 연결)를 받아 통합 결과를 반환하는 비동기 함수
+            max_chars: 한 묶음의 최대 문자 수 (기본값: settings.reduce_max_chars)
+
+        Returns:
+            마지막 묶음 텍스트 ("\n\n" 연결, 부분 결과가 없으면 빈 문자열)
         """
         if max_chars is None:
-            max_chars = settings.chunk_size
+            max_chars = settings.reduce_max_chars
 
-        paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
-        chunks = []
-        current_chunk = ""
+        parts = [p for p in parts if p and p.strip()]
+        if not parts:
+            return ""
 
-        for paragraph in paragraphs:
-            if len(current_chunk) + len(paragraph) + 2 <= max_chars:
-                current_chunk = f"{current_chunk}\n\n{paragraph}" if current_chunk else paragraph
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk)
-                current_chunk = paragraph
+        while True:
+            # 최대 문자 수 안에서 묶음 구성 (진행 보장을 위해 묶음당 최소 2개)
+            batches = []
+            current = []
+            current_len = 0
+            for part in parts:
+                if len(current) >= 2 and current_len + len(part) + 2 > max_chars:
+                    batches.append(current)
+                    current = []
+                    current_len = 0
+                current.append(part)
+                current_len += len(part) + 2
+            if current:
+                batches.append(current)
 
-        if current_chunk:
-            chunks.append(current_chunk)
+            if len(batches) == 1:
+                return "\n\n".join(batches[0])
 
-        return chunks
+            parts = await self.map_concurrent(
+                reduce_func, ["\n\n".join(batch) for batch in batches]
+            )
+
+    def chunk_text(self, text: str, max_chars: int = None, overlap: int = None) -> list:
+        """
+        텍스트를 문장 경계를 지키는 청크로 분할
+
+        Args:
+            text: 분할할 텍스트
+            max_chars: 최대 문자 수 (기본값: settings.chunk_size)
+            overlap: 청크 간 겹침 문자 수 (기본값: settings.chunk_overlap)
+
+        Returns:
+            청크 목록
+        """
+        return chunk_text(text, max_chars, overlap)
@@ -1,41 +1,211 @@
+from openai import (
+    AuthenticationError, PermissionDeniedError, RateLimitError,
+    APIConnectionError, InternalServerError
+)
 from app.services.openai_service import OpenAIService
-from langchain_community.document_loaders import PyPDFLoader
-import fitz
-from PIL import Image
-import io
-import base64
-import os
+from app.services import pdf_worker
+from app.core.config import settings
+from app.core.executor import run_cpu_bound, page_ranges, gather_or_cancel
+from typing import Optional, List, Tuple, Callable
+import asyncio
+
+OCR_PROMPT = "아래 이미지에서 보이는 텍스트를 가능한 한 정확히 추출해줘."
+
+FIGURE_PROMPT = (
+    "이미지의 그래프/도식/표를 한국어로 요약해줘. 핵심 포인트 3~5개 불릿:\n"
+    "- 그래프: 축 의미/추세/최대·최소/비교\n"
+    "- 도식: 노드/관계/절차\n"
+    "- 표: 핵심 행·열과 결론"
+)
+
+# 진행률 콜백: (처리된 페이지 수, 전체 페이지 수)
+ProgressCallback = Callable[[int, int], None]
+
+def join_pages(page_texts: List[Tuple[str, bool]]) -> Tuple[str, List[dict]]:
+    """
+    페이지별 텍스트를 문서 텍스트로 합치고 페이지별 위치 기록
+
+    Args:
+        page_texts: 페이지 순서의 (텍스트, OCR 사용 여부) 목록
+
+    Returns:
+        (문서 텍스트("\n\n" 연결, 빈 페이지 제외), 페이지 정보 목록)
+        페이지 정보: {"page_number", "text", "start_offset", "end_offset", "ocr_used"}
+    """
+    parts = []
+    pages = []
+    position = 0
+
+    for index, (text, ocr_used) in enumerate(page_texts):
+        text = (text or "").strip()
+
+        if text:
+            if parts:
+                position += 2
+            parts.append(text)
+
+        start = position
+        position += len(text)
+
+        pages.append({
+            "page_number": index + 1,
+            "text": text,
+            "start_offset": start,
+            "end_offset": position,
+            "ocr_used": ocr_used
+        })
+
+    return "\n\n".join(parts), pages
+
+def _image_options() -> tuple:
+    """Vision 입력 이미지 렌더링 옵션 (dpi, format, quality, max_side)"""
+    return (
+        settings.vision_image_dpi,
+        settings.vision_image_format,
+        settings.vision_image_quality,
+        settings.vision_image_max_side
+    )
+
+def _ocr_options() -> tuple:
+    """페이지별 OCR 판단 옵션 (auto_ocr, min_text_density, max_garbled_ratio)"""
+    return (
+        settings.ocr_mode == "auto",
+        settings.ocr_min_text_density,
+        settings.ocr_max_garbled_ratio
+    )
+
+def _figure_options(repeated_images: List[str]) -> dict:
+    """그림 페이지 판별 옵션 (pdf_worker.is_figure_page 키워드 인자)"""
+    return {
+        "min_image_ratio": settings.figure_min_image_ratio,
+        "tiny_image_ratio": settings.figure_tiny_image_ratio,
+        "min_drawings": settings.figure_min_drawings,
+        "detect_tables": settings.figure_detect_tables,
+        "repeated_images": repeated_images
+    }
+
+class VisionFatalError(ValueError):
+    """재시도해도 소용없는 Vision 호출 오류 (인증/권한/사용량 소진/설정)"""
+    pass
+
+def _is_transient_error(e: Exception) -> bool:
+    """재시도할 일시적 오류인지 판단 (요청 한도, 타임아웃/연결 오류, 5xx)"""
+    if isinstance(e, RateLimitError):
+        # 사용량(크레딧) 소진은 재시도해도 계속 실패
+        return getattr(e, "code", None) != "insufficient_quota"
+    return isinstance(e, (APIConnectionError, InternalServerError))
+
+def _is_fatal_error(e: Exception) -> bool:
+    """문서 전체를 즉시 실패시킬 오류인지 판단"""
+    if isinstance(e, RateLimitError):
+        return getattr(e, "code", None) == "insufficient_quota"
+    return isinstance(e, (AuthenticationError, PermissionDeniedError, ValueError))
 
 class PDFService:
     """PDF 처리 서비스 (Streamlit 앱 로직 이식)"""
 
-    def __init__(self):
-        self.openai_service = OpenAIService()
+    def __init__(self, openai_service: Optional[OpenAIService] = None):
+        self.openai_service = openai_service or OpenAIService()
+
+    async def process_document(
+        self,
+        pdf_path: str,
+        use_ocr: bool = False,
+        analyze_images: bool = False,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Tuple[str, Optional[list], List[dict], List[int]]:
+        """
+        업로드된 PDF 전체 처리 (텍스트 추출 또는 OCR + 이미지 분석)
+
+        Args:
+            pdf_path: PDF 파일 경로
+            use_ocr: OCR 사용 여부
+            analyze_images: 이미지/그래프 분석 여부
+            on_progress: 페이지 진행률 콜백
+
+        Returns:
+            (추출된 텍스트, 이미지 분석 결과 또는 None, 페이지 정보 목록 (join_pages 참고),
+             Vision 호출이 실패한 페이지 인덱스 목록)
+        """
+        # OCR/이미지 분석은 페이지를 한 번만 렌더링하는 공용 파이프라인으로 처리
+        page_texts, image_analysis, failed_pages = None, None, []
+        if use_ocr or analyze_images:
+            page_texts, image_analysis, failed_pages = await self.process_pages(
+                pdf_path,
+                use_ocr=use_ocr,
+                analyze_images=analyze_images,
+                on_progress=on_progress
+            )
+
+        # 텍스트 추출 (OCR 미사용 시 텍스트 레이어)
+        if not use_ocr:
+            page_texts = await self.extract_page_texts(
+                pdf_path,
+                on_progress=None if analyze_images else on_progress
+            )
+
+            page_texts = [(text, False) for text in page_texts]
+
+        content, pages = join_pages(page_texts)
+        return content, image_analysis, pages, failed_pages
 
-    async def extract_text(self, pdf_path: str) -> str:
+    async def extract_text(
+        self,
+        pdf_path: str,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> str:
         """
-        PDF에서 텍스트 추출 (PyPDFLoader 사용)
+        PDF에서 텍스트 추출 (PyPDFLoader와 동일한 pypdf 추출, 페이지 범위별 프로세스 풀 실행)
 
         Args:
             pdf_path: PDF 파일 경로
+            on_progress: 페이지 진행률 콜백
 
         Returns:
             추출된 텍스트
         """
+        page_texts = await self.extract_page_texts(pdf_path, on_progress)
+        content, _ = join_pages([(text, False) for text in page_texts])
+        return content
+
+    async def extract_page_texts(
+        self,
+        pdf_path: str,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> List[str]:
+        """
+        PDF 텍스트 레이어를 페이지별로 추출
+
+        Args:
+            pdf_path: PDF 파일 경로
+            on_progress: 페이지 진행률 콜백
+
+        Returns:
+            페이지 순서의 텍스트 목록
+        """
         try:
-            loader = PyPDFLoader(pdf_path)
-            pages = loader.load()
+            page_count = await run_cpu_bound(pdf_worker.count_pages, pdf_path)
 
-            if not pages:
-                return ""
+            if page_count == 0:
+                return []
 
-            text_parts = []
-            for page in pages:
-                content = (page.page_content or "").strip()
-                text_parts.append(content)
+            done = 0
 
-            result = "\n\n".join(text_parts).strip()
-            return result
+            async def extract_range(page_range) -> List[str]:
+                nonlocal done
+                start, end = page_range
+                texts = await run_cpu_bound(pdf_worker.extract_text_range, pdf_path, start, end)
+
+                done += end - start
+                if on_progress:
+                    on_progress(done, page_count)
+                return texts
+
+            range_texts = await gather_or_cancel(
+                extract_range(page_range) for page_range in page_ranges(page_count)
+            )
+
+            return [text for texts in range_texts for text in texts]
 
         except Exception as e:
             raise Exception(f"텍스트 추출 중 오류 발생: {str(e)}")
@@ -52,28 +222,9 @@ class PDFService:
             OCR로 추출된 텍스트
         """
         try:
-            doc = fitz.open(pdf_path)
-            all_texts = []
-
-            for i, page in enumerate(doc, 1):
-                # 페이지를 이미지로 렌더링 (200 DPI)
-                pix = page.get_pixmap(dpi=200)
-                img = Image.open(io.BytesIO(pix.tobytes("png")))
-
-                # Base64 인코딩
-                buf = io.BytesIO()
-                img.save(buf, format="PNG")
-                img_b64 = base64.b64encode(buf.getvalue()).decode("utf-8")
-
-                # GPT-4o Vision으로 OCR
-                text = await self.openai_service.vision_completion(
-                    text="아래 이미지에서 보이는 텍스트를 가능한 한 정확히 추출해줘.",
-                    image_base64=img_b64
-                )
-
-                all_texts.append(text.strip())
-
-            return "\n\n".join(all_texts)
+            page_texts, _, _ = await self.process_pages(pdf_path, use_ocr=True, analyze_images=False)
+            content, _ = join_pages(page_texts)
+            return content
 
         except Exception as e:
             raise Exception(f"OCR 처리 중 오류 발생: {str(e)}")
@@ -90,43 +241,172 @@ class PDFService:
             이미지 분석 결과 목록
         """
         try:
-            doc = fitz.open(pdf_path)
-            analysis_results = []
-
-            for page_num, page in enumerate(doc):
-                # 텍스트가 적거나 이미지가 있는 페이지를 찾음
-                text_length = len(page.get_text().strip())
-                images = page.get_images(full=True)
-
-                if text_length < 200 or len(images) >= 1:
-                    # 페이지를 이미지로 렌더링
-                    pix = page.get_pixmap(dpi=200)
-                    img = Image.open(io.BytesIO(pix.tobytes("png")))
-
-                    # Base64 인코딩
-                    buf = io.BytesIO()
-                    img.save(buf, format="PNG")
-                    img_b64 = base64.b64encode(buf.getvalue()).decode("utf-8")
-
-                    # GPT-4o Vision으로 이미지 분석
-                    prompt = (
-                        "이미지의 그래프/도식/표를 한국어로 요약해줘. 핵심 포인트 3~5개 불릿:\n"
-                        "- 그래프: 축 의미/추세/최대·최소/비교\n"
-                        "- 도식: 노드/관계/절차\n"
-                        "- 표: 핵심 행·열과 결론"
-                    )
-
-                    description = await self.openai_service.vision_completion(
-                        text=prompt,
-                        image_base64=img_b64
-                    )
-
-                    analysis_results.append({
-                        "page": page_num + 1,
-                        "description": description.strip()
-                    })
-
+            _, analysis_results, _ = await self.process_pages(pdf_path, use_ocr=False, analyze_images=True)
             return analysis_results
 
         except Exception as e:
             raise Exception(f"이미지 분석 중 오류 발생: {str(e)}")
+
+    async def process_pages(
+        self,
+        pdf_path: str,
+        use_ocr: bool,
+        analyze_images: bool,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Tuple[Optional[List[Tuple[str, bool]]], Optional[list], List[int]]:
+        """
+        문서를 한 번 열고 각 페이지를 한 번만 렌더링한 뒤 OCR/그림 분석 단계로 분배
+
+        settings.ocr_mode가 auto면 텍스트 레이어가 충분한 페이지는 텍스트 레이어를 쓰고
+        글자가 적거나 깨진 페이지만 Vision OCR로 보낸다.
+
+        Args:
+            pdf_path: PDF 파일 경로
+            use_ocr: OCR 수행 여부
+            analyze_images: 이미지/그래프 분석 여부
+            on_progress: 페이지 진행률 콜백
+
+        Returns:
+            (페이지별 (텍스트, OCR 사용 여부) 목록 또는 None, 이미지 분석 결과 또는 None,
+             Vision 호출이 실패한 페이지 인덱스 목록)
+
+        Raises:
+            VisionFatalError: 인증/권한/사용량 소진 등으로 Vision 호출이 불가능한 경우
+            Exception: Vision 호출 실패 비율이 settings.ocr_max_failed_ratio를 넘은 경우
+        """
+        page_count = await run_cpu_bound(pdf_worker.count_pages, pdf_path)
+
+        # 로고 등 여러 페이지에 반복되는 이미지는 문서 전체에서 한 번 찾아 그림 판별에서 제외
+        figure_options = None
+        if analyze_images:
+            repeated_images = await run_cpu_bound(
+                pdf_worker.find_repeated_images, pdf_path, settings.figure_repeat_min_pages
+            )
+            figure_options = _figure_options(repeated_images)
+
+        vision_semaphore = asyncio.Semaphore(max(1, settings.ocr_max_concurrency))
+        done = 0
+
+        vision_calls, failed_calls = 0, 0
+        failed_pages = set()
+        # 문서 전체의 최대 Vision 호출 수 (페이지당 OCR 1회 + 그림 분석 1회)
+        max_calls = page_count * (int(use_ocr) + int(analyze_images))
+
+        def failure() -> Exception:
+            return Exception(
+                f"Vision 처리 실패: {len(failed_pages)}개 페이지 ({failed_calls}/{vision_calls}회 호출 실패)"
+            )
+
+        async def vision(prompt: str, page_index: int, img_b64: str, mime_type: str) -> Optional[str]:
+            nonlocal vision_calls, failed_calls
+            vision_calls += 1
+            result = await self._vision_page(prompt, page_index, img_b64, mime_type, vision_semaphore)
+            if result is None:
+                failed_calls += 1
+                failed_pages.add(page_index)
+                # 남은 호출이 모두 성공해도 실패 비율을 넘으면 나머지 페이지를 기다리지 않고 중단
+                if failed_calls > settings.ocr_max_failed_ratio * max_calls:
+                    raise failure()
+            return result
+
+        async def process_range(page_range) -> List[Tuple[int, str, bool, Optional[str]]]:
+            start, end = page_range
+            # 페이지 범위를 프로세스 풀에서 한 번만 렌더링
+            pages = await run_cpu_bound(
+                pdf_worker.render_pages, pdf_path, start, end,
+                use_ocr, analyze_images, *_image_options(), *_ocr_options(), figure_options
+            )
+
+            async def process_page(page) -> Tuple[int, str, bool, Optional[str]]:
+                nonlocal done
+                page_index, img_b64, mime_type, is_figure, text_layer = page
+                page_text, ocr_used, description = "", False, None
+
+                if use_ocr and text_layer is not None:
+                    # 텍스트 레이어가 충분한 페이지는 OCR 생략
+                    page_text = text_layer
+                elif use_ocr and img_b64:
+                    ocr_text = await vision(OCR_PROMPT, page_index, img_b64, mime_type)
+                    if ocr_text is not None:
+                        page_text, ocr_used = ocr_text, True
+                if is_figure and img_b64:
+                    description = await vision(FIGURE_PROMPT, page_index, img_b64, mime_type)
+
+                done += 1
+                if on_progress:
+                    on_progress(done, page_count)
+                return page_index, page_text, ocr_used, description
+
+            # 한 페이지라도 치명적 오류가 나면 같은 범위의 나머지 페이지 작업 취소
+            return await gather_or_cancel(process_page(page) for page in pages)
+
+        # 렌더링 중/대기 중인 이미지 수를 제한하기 위해 범위 단위 동시 실행 수도 제한
+        # (한 범위가 실패하면 나머지 범위도 취소)
+        range_results = await self.openai_service.map_concurrent(
+            process_range,
+            page_ranges(page_count),
+            max_concurrency=settings.ocr_max_concurrency
+        )
+        page_results = [result for results in range_results for result in results]
+
+        # 일부 페이지 실패는 허용하되 대부분 실패하면 빈 문서를 만들지 않고 실패 처리
+        if failed_calls and (
+            failed_calls == vision_calls
+            or failed_calls / vision_calls > settings.ocr_max_failed_ratio
+        ):
+            raise failure()
+
+        page_texts = None
+        if use_ocr:
+            page_texts = [(text, ocr_used) for _, text, ocr_used, _ in page_results]
+
+        image_analysis = None
+        if analyze_images:
+            image_analysis = [
+                {"page": page_index + 1, "description": description}
+                for page_index, _, _, description in page_results
+                if description
+            ]
+
+        return page_texts, image_analysis, sorted(failed_pages)
+
+    async def _vision_page(
+        self,
+        prompt: str,
+        page_index: int,
+        img_b64: str,
+        mime_type: str,
+        semaphore: asyncio.Semaphore
+    ) -> Optional[str]:
+        """
+        렌더링된 페이지 이미지를 GPT-4o Vision으로 처리 (일시적 오류만 재시도)
+
+        Args:
+            prompt: Vision 프롬프트 (OCR / 그림 분석)
+            page_index: 0부터 시작하는 페이지 인덱스
+            img_b64: Base64 인코딩된 페이지 이미지
+            mime_type: 이미지 MIME 타입
+            semaphore: Vision 호출 동시 실행 제한
+
+        Returns:
+            응답 텍스트 (실패하면 None)
+
+        Raises:
+            VisionFatalError: 인증/권한/사용량 소진/설정 오류 (재시도 없이 문서 처리 중단)
+        """
+        for attempt in range(settings.ocr_max_retries + 1):
+            try:
+                async with semaphore:
+                    text = await self.openai_service.vision_completion(
+                        text=prompt,
+                        image_base64=img_b64,
+                        mime_type=mime_type
+                    )
+                return (text or "").strip()
+            except Exception as e:
+                if _is_fatal_error(e):
+                    raise VisionFatalError(f"OpenAI Vision 호출 실패: {str(e)}")
+                if not _is_transient_error(e) or attempt >= settings.ocr_max_retries:
+                    # 한 페이지 실패로 전체 문서를 버리지 않음 (실패 비율은 호출자가 확인)
+                    return None
+                await asyncio.sleep(2 ** attempt)
@@ -0,0 +1,285 @@
+"""
+PDF 파싱/렌더링 워커 함수 (프로세스 풀에서 실행)
+
+프로세스 풀(spawn)에서 가볍게 import 되도록 앱 설정/서비스 모듈에 의존하지 않는다.
+모든 함수는 [start, end) 페이지 범위를 받아 해당 범위만 처리한다.
+"""
+from typing import List, Tuple, Optional, Iterable
+from collections import Counter
+from pypdf import PdfReader
+from PIL import Image
+import fitz
+import io
+import base64
+
+def count_pages(pdf_path: str) -> int:
+    """PDF 페이지 수 반환"""
+    with fitz.open(pdf_path) as doc:
+        return doc.page_count
+
+def _page_text(reader: PdfReader, index: int) -> str:
+    """
+    페이지 텍스트 레이어 추출 (PyPDFLoader와 동일한 pypdf 추출 방식)
+
+    OCR을 쓰지 않는 경로와 OCR auto 모드에서 텍스트 레이어를 쓰는 페이지가 같은 문서에서
+    같은 텍스트를 저장하도록 두 경로 모두 이 함수로 추출한다.
+    """
+    return (reader.pages[index].extract_text() or "").strip()
+
+def extract_text_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """
+    페이지 범위의 텍스트 레이어 추출
+
+    Args:
+        pdf_path: PDF 파일 경로
+        start: 시작 페이지 인덱스 (포함)
+        end: 끝 페이지 인덱스 (미포함)
+
+    Returns:
+        페이지별 텍스트 목록
+    """
+    reader = PdfReader(pdf_path)
+    return [_page_text(reader, i) for i in range(start, min(end, len(reader.pages)))]
+
+IMAGE_MIME_TYPES = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+}
+
+def render_page_image(
+    page: "fitz.Page",
+    dpi: int = 200,
+    image_format: str = "png",
+    quality: int = 85,
+    max_side: int = 0
+) -> Tuple[str, str]:
+    """
+    페이지를 Vision 입력용 이미지로 한 번에 렌더링/인코딩
+
+    max_side를 넘지 않도록 렌더링 DPI 자체를 낮추므로 별도 리샘플링이나 재인코딩이 없다.
+
+    Args:
+        page: PyMuPDF 페이지
+        dpi: 최대 렌더링 해상도
+        image_format: 이미지 형식 (png / jpeg / webp)
+        quality: JPEG/WebP 품질 (1~100)
+        max_side: 긴 변 최대 픽셀 수 (0이면 제한 없음)
+
+    Returns:
+        (Base64 인코딩 이미지, MIME 타입)
+    """
+    image_format = image_format.lower()
+    if image_format == "jpg":
+        image_format = "jpeg"
+    if image_format not in IMAGE_MIME_TYPES:
+        raise ValueError(f"지원하지 않는 이미지 형식입니다: {image_format}")
+
+    # Vision 모델의 유효 해상도를 넘지 않도록 DPI 조정
+    if max_side:
+        longest_pt = max(page.rect.width, page.rect.height)
+        if longest_pt > 0:
+            dpi = min(dpi, int(max_side * 72 / longest_pt))
+    dpi = max(1, int(dpi))
+
+    pix = page.get_pixmap(dpi=dpi)
+
+    if image_format == "png":
+        data = pix.tobytes("png")
+    elif image_format == "jpeg":
+        data = pix.tobytes("jpeg", jpg_quality=quality)
+    else:
+        # WebP는 PyMuPDF가 직접 지원하지 않으므로 원시 픽셀에서 한 번만 인코딩
+        mode = "RGBA" if pix.alpha else "RGB"
+        img = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+        buf = io.BytesIO()
+        img.save(buf, format="WEBP", quality=quality)
+        data = buf.getvalue()
+
+    return base64.b64encode(data).decode("utf-8"), IMAGE_MIME_TYPES[image_format]
+
+def _image_keys(info: dict) -> List[str]:
+    """이미지 식별 키 (같은 객체 xref / 같은 내용 해시)"""
+    keys = []
+    if info.get("xref"):
+        keys.append(f"xref:{info['xref']}")
+    if info.get("digest"):
+        keys.append(f"md5:{info['digest'].hex()}")
+    return keys
+
+def find_repeated_images(pdf_path: str, min_pages: int = 3) -> List[str]:
+    """
+    여러 페이지에 반복되는 이미지 찾기 (로고/머리글/배경 등, 그림 판별에서 제외)
+
+    Args:
+        pdf_path: PDF 파일 경로
+        min_pages: 이 페이지 수 이상에 나타나면 반복 이미지로 판단
+
+    Returns:
+        반복 이미지 키 목록 (_image_keys 형식)
+    """
+    counts = Counter()
+    with fitz.open(pdf_path) as doc:
+        if doc.page_count < min_pages:
+            return []
+
+        for page in doc:
+            keys = set()
+            for info in page.get_image_info(hashes=True, xrefs=True):
+                keys.update(_image_keys(info))
+            counts.update(keys)
+
+    return [key for key, count in counts.items() if count >= min_pages]
+
+def is_figure_page(
+    page: "fitz.Page",
+    min_image_ratio: float = 0.1,
+    tiny_image_ratio: float = 0.01,
+    min_drawings: int = 20,
+    detect_tables: bool = True,
+    repeated_images: Iterable[str] = ()
+) -> bool:
+    """
+    실제 그림/도식/표가 있는 페이지인지 판단
+
+    - 이미지: 작은 이미지와 여러 페이지에 반복되는 이미지(로고 등)를 빼고 페이지 면적 대비 비율로 판단
+    - 벡터 도형: 일정 크기 이상의 도형(선/사각형/곡선)이 많으면 그래프/도식으로 판단
+    - 표: PyMuPDF 표 인식 결과로 판단 (도형이 있는 페이지만 검사)
+
+    Args:
+        page: PyMuPDF 페이지
+        min_image_ratio: 그림으로 볼 이미지 면적 합계 비율 (페이지 면적 대비)
+        tiny_image_ratio: 이 비율 미만의 이미지는 무시 (아이콘/글머리 기호 등)
+        min_drawings: 그래프/도식으로 볼 최소 벡터 도형 수
+        detect_tables: 표 인식 여부
+        repeated_images: 무시할 반복 이미지 키 (find_repeated_images 결과)
+
+    Returns:
+        그림 페이지 여부
+    """
+    page_rect = page.rect
+    page_area = page_rect.width * page_rect.height
+    if page_area <= 0:
+        return False
+
+    repeated = set(repeated_images)
+
+    image_area = 0.0
+    for info in page.get_image_info(hashes=bool(repeated), xrefs=True):
+        if repeated and any(key in repeated for key in _image_keys(info)):
+            continue
+
+        bbox = fitz.Rect(info["bbox"]) & page_rect
+        area = bbox.width * bbox.height
+        if area / page_area >= tiny_image_ratio:
+            image_area += area
+
+    if image_area / page_area >= min_image_ratio:
+        return True
+
+    # 너무 작은 도형(밑줄/점 등)은 제외
+    drawings = [
+        d for d in page.get_drawings()
+        if max(d["rect"].width, d["rect"].height) >= 5
+    ]
+    if len(drawings) >= min_drawings:
+        return True
+
+    if detect_tables and drawings:
+        try:
+            return len(page.find_tables().tables) > 0
+        except Exception:
+            return False
+
+    return False
+
+def _is_garbled_char(ch: str) -> bool:
+    """텍스트 레이어 추출이 깨졌을 때 나타나는 글자인지 판단 (대체 문자/사용자 정의 영역/제어 문자)"""
+    code = ord(ch)
+    return ch == "\ufffd" or 0xE000 <= code <= 0xF8FF or (code < 32 and ch not in "\n\r\t")
+
+def needs_ocr(
+    page: "fitz.Page",
+    text: str,
+    min_text_density: float = 2.0,
+    max_garbled_ratio: float = 0.2
+) -> bool:
+    """
+    텍스트 레이어만으로 부족한 페이지인지 판단 (글자 밀도가 낮거나 깨진 글자가 많은 경우)
+
+    Args:
+        page: PyMuPDF 페이지
+        text: 페이지 텍스트 레이어
+        min_text_density: 100x100pt 당 최소 글자 수 (공백 제외)
+        max_garbled_ratio: 깨진 글자 비율 상한
+
+    Returns:
+        OCR 필요 여부
+    """
+    chars = [ch for ch in text if not ch.isspace()]
+    if not chars:
+        return True
+
+    area = page.rect.width * page.rect.height / 10000
+    if area > 0 and len(chars) / area < min_text_density:
+        return True
+
+    garbled = sum(1 for ch in chars if _is_garbled_char(ch))
+    return garbled / len(chars) > max_garbled_ratio
+
+def render_pages(
+    pdf_path: str,
+    start: int,
+    end: int,
+    render_all: bool = True,
+    detect_figures: bool = False,
+    dpi: int = 200,
+    image_format: str = "png",
+    quality: int = 85,
+    max_side: int = 0,
+    auto_ocr: bool = False,
+    min_text_density: float = 2.0,
+    max_garbled_ratio: float = 0.2,
+    figure_options: Optional[dict] = None
+) -> List[Tuple[int, Optional[str], Optional[str], bool, Optional[str]]]:
+    """
+    문서를 한 번만 열고 페이지 범위를 한 번씩만 렌더링 (OCR/그림 분석 공용)
+
+    Args:
+        pdf_path: PDF 파일 경로
+        start: 시작 페이지 인덱스 (포함)
+        end: 끝 페이지 인덱스 (미포함)
+        render_all: 모든 페이지 렌더링 여부 (OCR 사용 시)
+        detect_figures: 그림/도식 페이지 판별 여부 (False면 그림 페이지 판별 생략)
+        dpi, image_format, quality, max_side: render_page_image 참고
+        auto_ocr: render_all일 때 텍스트 레이어가 충분한 페이지는 OCR 대신 텍스트 레이어 사용
+        min_text_density, max_garbled_ratio: needs_ocr 참고
+        figure_options: is_figure_page 키워드 인자 (min_image_ratio, repeated_images 등)
+
+    Returns:
+        (페이지 인덱스, Base64 이미지, MIME 타입, 그림 페이지 여부, 텍스트 레이어) 목록
+        렌더링하지 않은 페이지는 이미지/MIME 타입이 None
+        텍스트 레이어는 auto_ocr에서 OCR이 필요 없다고 판단한 페이지만 채워짐 (나머지는 None)
+    """
+    pages = []
+    # 텍스트 레이어는 OCR 미사용 경로와 같은 pypdf 추출 결과 사용
+    reader = PdfReader(pdf_path) if render_all and auto_ocr else None
+
+    with fitz.open(pdf_path) as doc:
+        for i in range(start, min(end, doc.page_count)):
+            page = doc[i]
+            is_figure = detect_figures and is_figure_page(page, **(figure_options or {}))
+
+            text_layer = None
+            if render_all and auto_ocr:
+                text = _page_text(reader, i)
+                if not needs_ocr(page, text, min_text_density, max_garbled_ratio):
+                    text_layer = text
+
+            img_b64, mime_type = None, None
+            if (render_all and text_layer is None) or is_figure:
+                img_b64, mime_type = render_page_image(page, dpi, image_format, quality, max_side)
+
+            pages.append((i, img_b64, mime_type, is_figure, text_layer))
+
+    return pages
@@ -1,57 +1,54 @@
 from app.services.openai_service import OpenAIService
-from typing import Tuple
+from app.services.chunk_service import rank_chunks
+from app.services.token_service import pack_context
+from app.core.config import settings
+from typing import Tuple, Optional, List, AsyncIterator
 
 class QAService:
     """문서 기반 Q&A 서비스 (Streamlit 로직 이식)"""
 
-    def __init__(self):
-        self.openai_service = OpenAIService()
+    def __init__(self, openai_service: Optional[OpenAIService] = None):
+        self.openai_service = openai_service or OpenAIService()
 
     def _build_qa_context(
         self,
         full_text: str,
         question: str,
-        max_ctx_chars: int = 16000
+        max_ctx_tokens: int = None,
+        top_chunks: Optional[List[str]] = None
     ) -> str:
         """
-        임베딩 없이 동작하는 미니 RAG
+        임베딩 없이 동작하는 미니 RAG (BM25 키워드 검색)
         (Streamlit build_qa_context 함수 이식)
 
         Args:
             full_text: 전체 문서 텍스트
             question: 질문
-            max_ctx_chars: 최대 컨텍스트 문자 수
+            max_ctx_tokens: 컨텍스트 토큰 예산 (기본값: settings.qa_max_ctx_tokens)
+            top_chunks: 저장된 역색인으로 미리 검색한 상위 청크 (없으면 즉석에서 분할/순위화)
 
         Returns:
             관련 컨텍스트
         """
-        # 문서를 작은 청크로 분할
-        chunks = self.openai_service.chunk_text(full_text, max_chars=3000)
+        if max_ctx_tokens is None:
+            max_ctx_tokens = settings.qa_max_ctx_tokens
 
-        if not chunks:
-            return ""
-
-        # 아주 단순한 키워드 기반 스코어
-        q_tokens = set(question.lower().split())
-        scored = []
-
-        for chunk in chunks:
-            c_tokens = set(chunk.lower().split())
-            overlap = len(q_tokens & c_tokens)
-            # 너무 긴 청크는 약간 패널티
-            score = overlap - 0.00001 * len(chunk)
-            scored.append((score, chunk))
+        if top_chunks is None:
+            # 문서를 작은 청크로 분할 후 BM25로 순위화
+            chunks = self.openai_service.chunk_text(full_text, max_chars=settings.qa_chunk_size)
+            top_chunks = rank_chunks(chunks, question, top_k=settings.qa_top_k)
 
-        # 상위 3~4개 컨텍스트로 묶기
-        top_chunks = sorted(scored, key=lambda x: x[0], reverse=True)[:4]
-        top_ctx = "\n\n---\n\n".join([chunk for _, chunk in top_chunks])
+        if not top_chunks:
+            return ""
 
-        return top_ctx[:max_ctx_chars]
+        # 상위 청크를 토큰 예산 안에서 통째로 묶기 (넘치는 청크는 관련 문장만)
+        return pack_context(top_chunks, question, max_tokens=max_ctx_tokens)
 
     async def answer_question(
         self,
         full_text: str,
-        question: str
+        question: str,
+        top_chunks: Optional[List[str]] = None
     ) -> Tuple[str, str]:
         """
         문서 근거 기반으로만 답변
@@ -60,13 +57,58 @@ class QAService:
         Args:
             full_text: 전체 문서 텍스트
             question: 질문
+            top_chunks: 저장된 역색인으로 미리 검색한 상위 청크
 
         Returns:
             (답변, 사용된 컨텍스트)
         """
         # 관련 컨텍스트 추출
-        context = self._build_qa_context(full_text, question)
+        context = self._build_qa_context(full_text, question, top_chunks=top_chunks)
+
+        answer = await self.openai_service.chat_completion(
+            messages=self._qa_messages(context, question),
+            temperature=0.1
+        )
+
+        return answer, context
+
+    def stream_answer(
+        self,
+        full_text: str,
+        question: str,
+        top_chunks: Optional[List[str]] = None
+    ) -> Tuple[str, AsyncIterator[str]]:
+        """
+        문서 근거 기반 답변 스트리밍
+
+        Args:
+            full_text: 전체 문서 텍스트
+            question: 질문
+            top_chunks: 저장된 역색인으로 미리 검색한 상위 청크
 
+        Returns:
+            (사용된 컨텍스트, 답변 텍스트 조각 비동기 이터레이터)
+        """
+        context = self._build_qa_context(full_text, question, top_chunks=top_chunks)
+
+        stream = self.openai_service.chat_completion_stream(
+            messages=self._qa_messages(context, question),
+            temperature=0.1
+        )
+
+        return context, stream
+
+    def _qa_messages(self, context: str, question: str) -> list:
+        """
+        Q&A 프롬프트 메시지 구성
+
+        Args:
+            context: 문서 컨텍스트
+            question: 질문
+
+        Returns:
+            메시지 목록
+        """
         # 시스템 프롬프트
         system = (
             "너는 문서 기반 Q&A 조교다. 반드시 제공된 문서 컨텍스트 안에서만 답하라. "
@@ -76,14 +118,7 @@ class QAService:
 
         user = f"[컨텍스트]\n{context}\n\n[질문]\n{question}"
 
-        messages = [
+        return [
             {"role": "system", "content": system},
             {"role": "user", "content": user}
         ]
-
-        answer = await self.openai_service.chat_completion(
-            messages=messages,
-            temperature=0.1
-        )
-
-        return answer, context
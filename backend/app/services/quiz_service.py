@@ -1,13 +1,14 @@
 from app.services.openai_service import OpenAIService
+from app.core.config import settings
 import json
 import re
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional
 
 class QuizService:
     """퀴즈 생성 및 채점 서비스 (Streamlit 앱 로직 이식)"""
 
-    def __init__(self):
-        self.openai_service = OpenAIService()
+    def __init__(self, openai_service: Optional[OpenAIService] = None):
+        self.openai_service = openai_service or OpenAIService()
 
     def _extract_json_block(self, text: str) -> str:
         """
@@ -19,43 +20,71 @@ class QuizService:
             raise ValueError("모델 응답에서 JSON 블록을 찾지 못했습니다.")
         return m.group(0)
 
-    async def _extract_keypoints_for_quiz(self, full_text: str) -> str:
+    async def _extract_keypoints_for_quiz(
+        self,
+        full_text: str,
+        chunks: Optional[List[str]] = None
+    ) -> str:
         """
         긴 문서에서 문제거리가 될 핵심 포인트를 먼저 뽑아냄
         (Streamlit extract_keypoints_for_quiz 함수 이식)
 
         Args:
             full_text: 전체 문서 텍스트
+            chunks: 저장된 청크 (settings.quiz_chunk_size 기준, 없으면 즉석에서 분할)
 
         Returns:
             핵심 키포인트 (15~25개)
         """
-        chunks = self.openai_service.chunk_text(full_text, max_chars=4000)
+        if chunks is None:
+            chunks = self.openai_service.chunk_text(full_text, max_chars=settings.quiz_chunk_size)
 
         if not chunks:
             return ""
 
-        # 각 청크에서 키포인트 추출
-        bullets = []
-        for chunk in chunks:
-            prompt = (
-                "너는 대학 교재로부터 문제거리가 될 '핵심 키포인트'를 뽑는 조교다.\n"
-                "아래 본문에서 정의/핵심 개념/중요 규칙/예외/용어를 한국어 불릿 5~8개로만 정리해라.\n\n"
-                f"[본문]\n{chunk}"
-            )
+        # 각 청크에서 키포인트 추출 (동시 실행, 청크 순서 유지)
+        bullets = await self.openai_service.map_concurrent(
+            self._extract_chunk_keypoints, chunks
+        )
+
+        # 부분 키포인트를 계층적으로 통합
+        return await self.openai_service.tree_reduce(
+            bullets, self._reduce_keypoints
+        )
+
+    async def _extract_chunk_keypoints(self, chunk: str) -> str:
+        """
+        청크 하나에서 키포인트 5~8개 추출
 
-            messages = [{"role": "user", "content": prompt}]
+        Args:
+            chunk: 본문 청크
 
-            result = await self.openai_service.chat_completion(
-                messages=messages,
-                temperature=0.2
-            )
+        Returns:
+            부분 키포인트
+        """
+        prompt = (
+            "너는 대학 교재로부터 문제거리가 될 '핵심 키포인트'를 뽑는 조교다.\n"
+            "아래 본문에서 정의/핵심 개념/중요 규칙/예외/용어를 한국어 불릿 5~8개로만 정리해라.\n\n"
+            f"[본문]\n{chunk}"
+        )
 
-            bullets.append(result)
+        messages = [{"role": "user", "content": prompt}]
 
-        # 부분 키포인트 통합
-        merged = "\n\n".join(bullets)
+        return await self.openai_service.chat_completion(
+            messages=messages,
+            temperature=0.2
+        )
 
+    async def _reduce_keypoints(self, merged: str) -> str:
+        """
+        부분 키포인트 묶음을 중복 제거하여 15~25개로 통합
+
+        Args:
+            merged: "\n\n"으로 연결된 부분 키포인트
+
+        Returns:
+            통합 키포인트
+        """
         reducer = (
             "아래 부분 키포인트 목록을 중복 제거하고, 용어를 통일해 한국어로 15~25개 핵심 키포인트만 남겨라.\n"
             "불필요한 예시는 제외하고 '정의/원리/규칙/구조/절차' 중심으로 재정리하라.\n\n"
@@ -71,7 +100,25 @@ class QuizService:
 
         return final_keypoints
 
-    async def generate_quiz(self, full_text: str, num_items: int = 10) -> List[Dict[str, Any]]:
+    async def extract_keypoints(self, full_text: str, chunks: Optional[List[str]] = None) -> str:
+        """
+        퀴즈 생성용 핵심 키포인트 추출 (문서별로 저장해 재사용)
+
+        Args:
+            full_text: 전체 문서 텍스트
+            chunks: 저장된 청크 (없으면 즉석에서 분할)
+
+        Returns:
+            핵심 키포인트 (15~25개)
+        """
+        return await self._extract_keypoints_for_quiz(full_text, chunks)
+
+    async def generate_quiz(
+        self,
+        full_text: str,
+        num_items: int = 10,
+        keypoints: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """
         문서 기반 퀴즈 생성 (객관식/주관식)
         (Streamlit generate_quiz_from_doc 함수 이식)
@@ -79,6 +126,7 @@ class QuizService:
         Args:
             full_text: 전체 문서 텍스트
             num_items: 생성할 문항 수 (5, 10, 15, 20)
+            keypoints: 저장된 키포인트 (있으면 추출 생략, LLM 호출 1회)
 
         Returns:
             퀴즈 문항 목록
@@ -86,7 +134,8 @@ class QuizService:
         num_items = max(5, min(20, int(num_items)))
 
         # 핵심 키포인트 추출
-        keypoints = await self._extract_keypoints_for_quiz(full_text)
+        if keypoints is None:
+            keypoints = await self._extract_keypoints_for_quiz(full_text)
 
         # 퀴즈 생성 프롬프트
         prompt = f"""
@@ -0,0 +1,124 @@
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.models import Document
+from app.services.chunk_service import build_chunk_index, bm25_scores, load_chunks
+from app.services.chunk_store import get_chunk_spans
+from app.services.vector_service import build_vector_index, has_vector_index, vector_scores
+from typing import List, Dict, Optional, Tuple
+import asyncio
+import threading
+
+# 같은 프로세스에서 같은 색인을 동시에 만들지 않도록 직렬화
+_index_lock = threading.Lock()
+
+def build_qa_indexes(document_id: str):
+    """
+    Q&A 검색 색인 생성 (이미 있으면 생략, 워커 스레드에서 별도 세션으로 실행)
+
+    Args:
+        document_id: 문서 ID
+    """
+    with _index_lock:
+        db = SessionLocal()
+        try:
+            document = db.query(Document).filter(Document.id == document_id).first()
+            if not document or not document.content:
+                return
+
+            chunk_size = settings.qa_chunk_size
+            build_chunk_index(db, document.id, document.content, chunk_size)
+
+            # 벡터 행렬이 이미 있으면 청크 텍스트를 읽지 않음
+            if settings.qa_retrieval_mode in ("dense", "hybrid") and not has_vector_index(document.id, chunk_size):
+                build_vector_index(document.id, chunk_size, load_chunks(db, document.id, chunk_size))
+        finally:
+            db.close()
+
+async def ensure_qa_indexes(document_id: str):
+    """
+    Q&A 검색 색인 준비 (큰 문서의 색인 생성이 이벤트 루프를 막지 않도록 스레드에서 실행)
+
+    Args:
+        document_id: 문서 ID
+    """
+    await asyncio.to_thread(build_qa_indexes, document_id)
+
+def _normalize(scores: Dict[int, float]) -> Dict[int, float]:
+    """최댓값 기준 0~1 정규화"""
+    top = max(scores.values(), default=0.0)
+    if top <= 0:
+        return {}
+    return {i: score / top for i, score in scores.items()}
+
+def retrieve_chunks(
+    db: Session,
+    document_id: str,
+    full_text: str,
+    question: str,
+    top_k: int = None,
+    mode: str = None,
+    char_range: Optional[Tuple[int, int]] = None
+) -> List[str]:
+    """
+    문서에서 질문과 관련된 상위 청크 검색 (색인은 ensure_qa_indexes로 미리 생성)
+
+    Args:
+        db: 데이터베이스 세션
+        document_id: 문서 ID
+        full_text: 전체 문서 텍스트
+        question: 질문
+        top_k: 반환할 청크 수 (기본값: settings.qa_top_k)
+        mode: bm25 / dense / hybrid (기본값: settings.qa_retrieval_mode)
+        char_range: 검색할 문자 구간 (페이지 범위 요청, 같은 검색 방식으로 범위와 겹치는 청크만 순위화)
+
+    Returns:
+        점수 내림차순 청크 텍스트 목록
+    """
+    if top_k is None:
+        top_k = settings.qa_top_k
+    if mode is None:
+        mode = settings.qa_retrieval_mode
+
+    chunk_size = settings.qa_chunk_size
+
+    # 페이지 범위 요청이면 범위와 겹치는 청크만 후보로 사용 (검색 방식은 그대로)
+    spans: Optional[Dict[int, Tuple[int, int]]] = None
+    if char_range is not None:
+        spans = {
+            index: (start, end)
+            for index, start, end in get_chunk_spans(db, document_id, chunk_size, char_range)
+        }
+
+    def in_range(chunk_scores: Dict[int, float]) -> Dict[int, float]:
+        if spans is None:
+            return chunk_scores
+        return {i: score for i, score in chunk_scores.items() if i in spans}
+
+    scores: Dict[int, float] = {}
+
+    if mode in ("bm25", "hybrid"):
+        for i, score in _normalize(in_range(bm25_scores(db, document_id, chunk_size, question))).items():
+            weight = 1.0 if mode == "bm25" else 1.0 - settings.qa_hybrid_alpha
+            scores[i] = scores.get(i, 0.0) + weight * score
+
+    if mode in ("dense", "hybrid"):
+        for i, score in in_range(vector_scores(document_id, chunk_size, question)).items():
+            weight = 1.0 if mode == "dense" else settings.qa_hybrid_alpha
+            scores[i] = scores.get(i, 0.0) + weight * score
+
+    # 일치하는 청크가 없으면 문서(범위) 앞부분 청크 사용
+    top_indexes = sorted(scores, key=lambda i: (-scores[i], i))[:top_k]
+    if not top_indexes:
+        top_indexes = list(spans)[:top_k] if spans is not None else list(range(top_k))
+
+    if spans is None:
+        return load_chunks(db, document_id, chunk_size, top_indexes)
+
+    # 범위 경계에 걸친 청크는 범위 안쪽만 잘라서 사용
+    range_start, range_end = char_range
+    chunks = [
+        full_text[max(spans[i][0], range_start):min(spans[i][1], range_end)].strip()
+        for i in top_indexes
+    ]
+    return [chunk for chunk in chunks if chunk]
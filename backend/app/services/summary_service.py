@@ -1,10 +1,33 @@
 from app.services.openai_service import OpenAIService
+from typing import Optional, AsyncIterator, List
+
+EMPTY_SUMMARY = "요약할 텍스트가 없습니다."
 
 class SummaryService:
     """문서 요약 서비스 (Streamlit 앱 로직 이식)"""
 
-    def __init__(self):
-        self.openai_service = OpenAIService()
+    def __init__(self, openai_service: Optional[OpenAIService] = None):
+        self.openai_service = openai_service or OpenAIService()
+
+    def _summary_messages(self, text: str) -> list:
+        """5줄 요약 프롬프트 메시지 구성"""
+        prompt = (
+            "다음 학습 자료를 한국어로 **5줄 이내**로 핵심만 요약해줘.\n"
+            "불필요한 예시는 빼고, 핵심 개념/정의/식 위주로 정리해줘.\n\n"
+            f"[본문]\n{text}"
+        )
+
+        return [{"role": "user", "content": prompt}]
+
+    def _reduce_messages(self, joined: str) -> list:
+        """부분 요약 통합 프롬프트 메시지 구성"""
+        final_prompt = (
+            "아래 부분 요약들을 **통합**해서 한국어로 **정확히 5줄 이내**로 핵심만 압축해줘.\n"
+            "중복 제거, 용어 통일, 수식/정의/핵심 논점만 남겨.\n\n"
+            f"[부분 요약]\n{joined}"
+        )
+
+        return [{"role": "user", "content": final_prompt}]
 
     async def _gpt_summarize_k5(self, text: str) -> str:
         """
@@ -17,62 +40,96 @@ class SummaryService:
         Returns:
             5줄 요약
         """
-        prompt = (
-            "다음 학습 자료를 한국어로 **5줄 이내**로 핵심만 요약해줘.\n"
-            "불필요한 예시는 빼고, 핵심 개념/정의/식 위주로 정리해줘.\n\n"
-            f"[본문]\n{text}"
-        )
-
-        messages = [{"role": "user", "content": prompt}]
-
         result = await self.openai_service.chat_completion(
-            messages=messages,
+            messages=self._summary_messages(text),
             temperature=0.2
         )
 
         return result
 
-    async def generate_summary(self, text: str) -> str:
+    async def generate_summary(self, text: str, chunks: Optional[List[str]] = None) -> str:
         """
         문서 전체 요약 생성
         (Streamlit summarize_long_text 함수 이식)
 
         Args:
             text: 요약할 전체 텍스트
+            chunks: 저장된 청크 (settings.chunk_size 기준, 없으면 즉석에서 분할)
 
         Returns:
             최종 요약
         """
         # 텍스트를 청크로 분할
-        chunks = self.openai_service.chunk_text(text)
+        if chunks is None:
+            chunks = self.openai_service.chunk_text(text)
 
         if not chunks:
-            return "요약할 텍스트가 없습니다."
+            return EMPTY_SUMMARY
 
         # 청크가 1개면 바로 요약
         if len(chunks) == 1:
             return await self._gpt_summarize_k5(chunks[0])
 
-        # 각 청크별 부분 요약 생성
-        part_summaries = []
-        for chunk in chunks:
-            summary = await self._gpt_summarize_k5(chunk)
-            part_summaries.append(summary)
-
-        # 부분 요약들을 통합
-        joined = "\n\n".join(part_summaries)
+        # 각 청크별 부분 요약 생성 (동시 실행, 청크 순서 유지)
+        part_summaries = await self.openai_service.map_concurrent(
+            self._gpt_summarize_k5, chunks
+        )
 
-        final_prompt = (
-            "아래 부분 요약들을 **통합**해서 한국어로 **정확히 5줄 이내**로 핵심만 압축해줘.\n"
-            "중복 제거, 용어 통일, 수식/정의/핵심 논점만 남겨.\n\n"
-            f"[부분 요약]\n{joined}"
+        # 부분 요약들을 계층적으로 통합 (긴 문서도 reduce 프롬프트 크기 제한)
+        return await self.openai_service.tree_reduce(
+            part_summaries, self._reduce_summaries
         )
 
-        messages = [{"role": "user", "content": final_prompt}]
+    async def stream_summary(self, text: str, chunks: Optional[List[str]] = None) -> AsyncIterator[str]:
+        """
+        문서 전체 요약 스트리밍 생성 (마지막 LLM 호출의 토큰을 바로 전달)
 
-        final_summary = await self.openai_service.chat_completion(
+        부분 요약/중간 통합은 generate_summary와 같고, 최종 요약 호출만 스트리밍한다.
+
+        Args:
+            text: 요약할 전체 텍스트
+            chunks: 저장된 청크 (없으면 즉석에서 분할)
+
+        Yields:
+            최종 요약 텍스트 조각
+        """
+        if chunks is None:
+            chunks = self.openai_service.chunk_text(text)
+
+        if not chunks:
+            yield EMPTY_SUMMARY
+            return
+
+        if len(chunks) == 1:
+            messages = self._summary_messages(chunks[0])
+        else:
+            part_summaries = await self.openai_service.map_concurrent(
+                self._gpt_summarize_k5, chunks
+            )
+            joined = await self.openai_service.reduce_to_final_batch(
+                part_summaries, self._reduce_summaries
+            )
+            messages = self._reduce_messages(joined)
+
+        async for piece in self.openai_service.chat_completion_stream(
             messages=messages,
             temperature=0.2
+        ):
+            yield piece
+
+    async def _reduce_summaries(self, joined: str) -> str:
+        """
+        부분 요약 묶음을 5줄 이내로 통합
+
+        Args:
+            joined: "\n\n"으로 연결된 부분 요약
+
+        Returns:
+            통합 요약
+        """
+        final_summary = await self.openai_service.chat_completion(
+            messages=self._reduce_messages(joined),
+            temperature=0.2
         )
 
         return final_summary
@@ -0,0 +1,58 @@
+"""
+토큰 예산 기반 컨텍스트 구성
+"""
+from app.services.chunk_service import rank_indexes
+from app.services.chunker import estimate_tokens, split_sentences
+from typing import List
+
+def pack_context(
+    chunks: List[str],
+    question: str,
+    max_tokens: int,
+    separator: str = "\n\n---\n\n"
+) -> str:
+    """
+    순위순 청크로 토큰 예산을 채워 컨텍스트 구성 (중간에서 자르지 않음)
+
+    청크가 통째로 들어가면 그대로 넣고, 들어가지 않으면 그 청크에서 질문과 관련 높은
+    문장부터 남은 예산에 맞는 문장만 골라 원래 순서로 넣는다.
+
+    Args:
+        chunks: 점수 내림차순 청크 목록
+        question: 질문 (문장 선택 기준)
+        max_tokens: 컨텍스트 토큰 예산
+        separator: 청크 구분자
+
+    Returns:
+        컨텍스트 문자열
+    """
+    separator_tokens = estimate_tokens(separator)
+    remaining = max_tokens
+    parts: List[str] = []
+
+    for chunk in chunks:
+        cost = separator_tokens if parts else 0
+        if remaining - cost <= 0:
+            break
+
+        chunk_tokens = estimate_tokens(chunk)
+        if chunk_tokens <= remaining - cost:
+            parts.append(chunk)
+            remaining -= cost + chunk_tokens
+            continue
+
+        # 청크가 남은 예산보다 크면 관련 높은 문장만 선택
+        sentences = split_sentences(chunk)
+        budget = remaining - cost
+        selected = []
+        for index in rank_indexes(sentences, question):
+            sentence_tokens = estimate_tokens(sentences[index]) + 1
+            if sentence_tokens <= budget:
+                selected.append(index)
+                budget -= sentence_tokens
+
+        if selected:
+            parts.append("\n".join(sentences[i] for i in sorted(selected)))
+            remaining = budget
+
+    return separator.join(parts)
@@ -0,0 +1,99 @@
+"""
+로컬 벡터 검색 (오프라인, 외부 임베딩 API 없음)
+
+청크를 해시 특징 벡터(검색어 → 고정 차원 버킷)로 임베딩해 문서별 float32 행렬(.npy)로 저장하고,
+질문 벡터와의 행렬-벡터 곱 한 번으로 코사인 유사도 상위 청크를 찾는다.
+"""
+from app.core.config import settings
+from app.services.chunk_service import analyze, INDEX_VERSION
+from typing import List, Dict
+from collections import Counter
+import numpy as np
+import math
+import os
+import zlib
+
+def embed_texts(texts: List[str], dim: int = None) -> np.ndarray:
+    """
+    텍스트를 L2 정규화된 해시 특징 벡터로 변환
+
+    검색어(단어/한글 2-gram)를 crc32로 버킷에 배정하고 부호 해시로 충돌을 상쇄하며,
+    빈도는 1 + log(tf)로 완화한다.
+
+    Args:
+        texts: 임베딩할 텍스트 목록
+        dim: 벡터 차원 (기본값: settings.vector_dim)
+
+    Returns:
+        (len(texts), dim) float32 행렬
+    """
+    if dim is None:
+        dim = settings.vector_dim
+
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+
+    for row, text in enumerate(texts):
+        for term, tf in Counter(analyze(text)).items():
+            h = zlib.crc32(term.encode("utf-8"))
+            sign = 1.0 if (h >> 31) & 1 else -1.0
+            matrix[row, h % dim] += sign * (1.0 + math.log(tf))
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+def _index_path(document_id: str, chunk_size: int) -> str:
+    """문서별 벡터 행렬 파일 경로 (분석기 버전이 바뀌면 새 파일로 다시 생성)"""
+    return os.path.join(
+        settings.vector_index_dir, f"{document_id}_{chunk_size}_v{INDEX_VERSION}.npy"
+    )
+
+def has_vector_index(document_id: str, chunk_size: int) -> bool:
+    """벡터 행렬 파일 존재 여부 (청크를 읽기 전에 확인)"""
+    return os.path.exists(_index_path(document_id, chunk_size))
+
+def build_vector_index(document_id: str, chunk_size: int, chunks: List[str]):
+    """
+    청크 벡터 행렬 생성/저장 (이미 있으면 생략)
+
+    Args:
+        document_id: 문서 ID
+        chunk_size: 청킹 기준 최대 문자 수
+        chunks: 문서 순서의 청크 텍스트 목록
+    """
+    path = _index_path(document_id, chunk_size)
+    if os.path.exists(path):
+        return
+
+    os.makedirs(settings.vector_index_dir, exist_ok=True)
+
+    # 다른 워커가 읽는 중에도 안전하도록 임시 파일에 쓰고 교체
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, embed_texts(chunks))
+    os.replace(tmp_path, path)
+
+def vector_scores(document_id: str, chunk_size: int, question: str) -> Dict[int, float]:
+    """
+    질문과 각 청크의 코사인 유사도 계산 (메모리 맵 행렬 × 질문 벡터)
+
+    Args:
+        document_id: 문서 ID
+        chunk_size: 청킹 기준 최대 문자 수
+        question: 질문
+
+    Returns:
+        {청크 인덱스: 유사도} (양수 유사도만)
+    """
+    path = _index_path(document_id, chunk_size)
+    if not os.path.exists(path):
+        return {}
+
+    matrix = np.load(path, mmap_mode="r")
+    query = embed_texts([question], dim=matrix.shape[1])[0]
+    similarities = matrix @ query
+
+    return {
+        int(i): float(similarities[i])
+        for i in np.flatnonzero(similarities > 0)
+    }